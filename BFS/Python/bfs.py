@@ -2,40 +2,166 @@
 Breadth-First Search (BFS) implementation.
 This class provides a blueprint for implementing BFS on a graph.
 """
+from array import array
 from collections import deque
+from heapq import heappop, heappush
+from operator import attrgetter, index
 from node import Node
+from csr_graph import CSRGraph
+from visited_set import VisitedSet
+from parallel_bfs import ParallelBFS
+from value_index import ValueIndex
+from disjoint_set import DisjointSet
+from component_labels import label_components
+from heuristics import euclidean
+from query_cache import QueryCache
+from landmark_oracle import LandmarkOracle
 
 class BFS:
-    def __init__(self):
+    def __init__(self, graph=None, index_values=False, node_class=Node, directed=False, cache_size=0):
         """
         Constructor to create a new BFS instance.
+        
+        Args:
+            graph: Optional CSRGraph backend. When given, nodes are integer ids
+                into the graph instead of Node objects, and the graph's own
+                directed flag is used.
+            index_values: Maintain a ValueIndex so lookups by value cost O(1);
+                find_level then uses it by default.
+                Values must then be hashable, and node values should be changed
+                through Node.set_value (or BFS.set_value for CSR ids).
+            node_class: Class used by add_node; pass SlottedNode to store
+                nodes without a per-instance __dict__.
+            directed: Make add_edge add node1 -> node2 only. Traversals follow
+                outgoing edges; incoming edges are kept separately for the
+                searches that walk edges backwards.
+            cache_size: Keep the results of up to this many find_path and
+                find_level queries in a QueryCache (0 disables it). Changes
+                made through this object or through its Node objects
+                invalidate it; changes made directly to a CSRGraph backend
+                do not.
         """
         self.nodes = []  # List of all nodes in the graph
+        self.node_class = node_class
+        self.graph = graph
+        self.directed = directed if graph is None else graph.directed
+        self.visited = VisitedSet()  # Visited node ids, shared by all traversals
+        self.components = DisjointSet()  # Connected components, updated by add_edge
+        self.coordinates = None  # Coordinates of each node (or None) by node id, once any are set
+        self.cache = QueryCache(cache_size) if cache_size > 0 else None
+        self.value_index = None  # Value -> nodes, when index_values is set
+        if index_values:
+            self.value_index = ValueIndex()
+            if graph is not None:
+                for node in graph.get_nodes():
+                    self.value_index.add(graph.get_value(node), node)
+        if graph is None:
+            self._neighbors = attrgetter("neighbors")
+            self._edges = lambda node: node.neighbors.items()
+            self._value = attrgetter("value")
+            self._index = attrgetter("index")
+        else:
+            self._neighbors = graph.neighbors
+            self._edges = graph.weighted_neighbors
+            self._value = graph.get_value
+            self._index = index
+        if not self.directed:
+            self._predecessors = self._neighbors
+        elif graph is None:
+            self._predecessors = lambda node: node.in_neighbors or ()
+        else:
+            self._predecessors = graph.predecessors
+        if graph is not None:
+            self.components.stale = True  # Built on first use, so opening a graph stays O(1)
     
-    def add_node(self, value):
+    def add_node(self, value, coordinates=None):
         """
         Add a new node to the graph.
         
         Args:
             value: The value to be stored in the new node
+            coordinates: Optional position of the node, passed to the
+                heuristic of find_path_astar
             
         Returns:
             The newly created node
         """
-        node = Node(value)
-        self.nodes.append(node)
+        if self.graph is not None:
+            node = self.graph.add_node(value)
+        else:
+            node = self.node_class(value)
+            node.index = len(self.nodes)
+            node.graph = self
+            self.nodes.append(node)
+        if self.cache is not None:
+            self.cache.invalidate()
+        if self.value_index is not None:
+            self.value_index.add(value, node)
+        self.components.add()
+        if coordinates is not None or self.coordinates is not None:
+            self.set_coordinates(node, coordinates)
         return node
     
-    def add_edge(self, node1, node2):
+    def set_value(self, node, value):
+        """
+        Set the value stored in a node, keeping the value index up to date.
+        
+        Args:
+            node: The node to update
+            value: The new value to be stored
+        """
+        if self.graph is None:
+            node.set_value(value)
+            return
+        old_value = self.graph.get_value(node)
+        self.graph.values[node] = value  # Raises on a read-only MappedGraph
+        if self.value_index is not None:
+            self.value_index.remove(old_value, node)
+            self.value_index.add(value, node)
+        if self.cache is not None:
+            self.cache.invalidate()
+    
+    def set_coordinates(self, node, coordinates):
+        """
+        Set the position of a node used by find_path_astar.
+        
+        Args:
+            node: The node to update
+            coordinates: The new position, in whatever form the heuristic takes
+        """
+        if self.coordinates is None:
+            if coordinates is None:
+                return
+            self.coordinates = []  # Allocated on first use, for graphs that run A*
+        missing = len(self.get_nodes()) - len(self.coordinates)
+        if missing > 0:
+            self.coordinates.extend([None] * missing)
+        self.coordinates[self._index(node)] = coordinates
+    
+    def add_edge(self, node1, node2, weight=1):
         """
         Add an edge between two nodes in the graph.
         
         Args:
-            node1: First node
-            node2: Second node
+            node1: First node (the source, if the graph is directed)
+            node2: Second node (the target, if the graph is directed)
+            weight: Weight of the edge, used by the weighted searches
+                (find_weighted_path); the unweighted ones count every edge as 1
         """
-        node1.add_neighbor(node2)
-        node2.add_neighbor(node1)  # For undirected graph
+        if self.graph is not None:
+            self.graph.add_edge(node1, node2, weight)
+            if len(self.components) != self.graph.node_count():
+                self.components.stale = True  # Nodes were added to the backend directly
+            elif not self.components.stale:
+                self.components.union(node1, node2)
+            if self.cache is not None:
+                self.cache.invalidate()
+            return
+        node1.add_neighbor(node2, weight)  # Also merges the components and invalidates the cache
+        if self.directed:
+            node2.add_in_neighbor(node1)
+        else:
+            node2.add_neighbor(node1, weight)  # For undirected graph
     
     def get_nodes(self):
         """
@@ -44,20 +170,123 @@ class BFS:
         Returns:
             List of all nodes
         """
+        if self.graph is not None:
+            return self.graph.get_nodes()
         return self.nodes
     
     def clear(self):
         """
         Clear all nodes from the graph.
         """
+        if self.graph is not None:
+            self.graph.clear()
+        for node in self.nodes:
+            node.graph = None
         self.nodes.clear()
+        if self.cache is not None:
+            self.cache.invalidate()
+        self.components.clear()
+        self.coordinates = None
+        if self.value_index is not None:
+            self.value_index.clear()
+    
+    def find_nodes(self, value):
+        """
+        Find all nodes holding a value.
+        
+        Args:
+            value: Value to search for
+            
+        Returns:
+            List of nodes holding the value, in insertion order; O(1) with a
+            value index, a scan of all nodes otherwise
+        """
+        if self.value_index is not None:
+            return list(self.value_index.get(value) or [])
+        return [node for node in self.get_nodes() if self._value(node) == value]
+    
+    def has_value(self, value):
+        """
+        Check if any node in the graph holds a value.
+        
+        Args:
+            value: Value to search for
+            
+        Returns:
+            True if a node holds the value, False otherwise
+        """
+        if self.value_index is not None:
+            return value in self.value_index
+        return any(self._value(node) == value for node in self.get_nodes())
     
     def reset_visited(self):
         """
         Reset visited status of all nodes.
         """
-        for node in self.nodes:
-            node.reset_visited()
+        self.visited.clear()
+    
+    def _begin_visit(self):
+        """
+        Start a new traversal on the shared visited set.
+        
+        Returns:
+            Tuple of (stamps, generation); node id i is visited when
+            stamps[i] == generation
+        """
+        generation = self.visited.begin(len(self.get_nodes()))
+        return self.visited.stamps, generation
+    
+    def iter_bfs(self, start_node):
+        """
+        Lazily perform BFS traversal starting from the given node.
+        
+        Nodes are yielded in the same order as bfs_traversal, as soon as they are
+        discovered, so a consumer that stops early never pays for the rest of
+        the component. The queue only holds the frontier, and visited node ids
+        go in private sets, so taking a few nodes from a huge graph costs no
+        O(V) setup, and the shared VisitedSet stays free for other queries
+        while the generator is suspended.
+        
+        In an undirected graph every neighbor of a node on level L is on level
+        L - 1, L or L + 1, so only the ids of those three levels are kept and
+        memory is bounded by the frontier. A directed edge can point back to
+        any earlier level, so a directed graph keeps the ids of every node
+        yielded so far.
+        
+        Args:
+            start_node: The node to start BFS from
+            
+        Yields:
+            Tuples of (value, level, parent value), with None as the parent of
+            start_node
+        """
+        if start_node is None:
+            return
+
+        index = self._index
+        value = self._value
+        # Ids seen on the previous, the expanding and the next level; a directed
+        # graph keeps all of them in one set
+        previous, current, following = set(), {index(start_node)}, set()
+        if self.directed:
+            previous = following = current
+        expanding = 0
+        queue = deque()
+        queue.append((start_node, 0))
+        yield value(start_node), 0, None
+
+        while len(queue) != 0:
+            node, level = queue.popleft()
+            if level != expanding and not self.directed:
+                previous, current, following = current, following, set()
+            expanding = level
+            parent = value(node)
+            for neighbor_node in self._neighbors(node):
+                i = index(neighbor_node)
+                if i not in following and i not in current and i not in previous:
+                    following.add(i)
+                    queue.append((neighbor_node, level + 1))
+                    yield value(neighbor_node), level + 1, parent
     
     def bfs_traversal(self, start_node):
         """
@@ -85,22 +314,24 @@ class BFS:
         if start_node == None:
             return []
 
-        visited = []
+        stamps, generation = self._begin_visit()
+        index = self._index
         result = []
         queue = deque()
         queue.append(start_node)
 
-        visited.append(start_node)
-        result.append(start_node.value)
+        stamps[index(start_node)] = generation
+        result.append(self._value(start_node))
 
         while len(queue) != 0:
             current = queue.popleft()
 
-            for neighbor_node in current.neighbors:
-                if neighbor_node not in visited:
+            for neighbor_node in self._neighbors(current):
+                i = index(neighbor_node)
+                if stamps[i] != generation:
                     queue.append(neighbor_node)
-                    visited.append(neighbor_node)
-                    result.append(neighbor_node.value)
+                    stamps[i] = generation
+                    result.append(self._value(neighbor_node))
         return result
 
     
@@ -115,6 +346,21 @@ class BFS:
         Returns:
             List of nodes representing the path, or empty list if no path exists
         """
+        if start_node is None or end_node is None:
+            return []
+        if self.cache is None:
+            return self._find_path(start_node, end_node)
+        key = ("path", self._index(start_node), self._index(end_node))
+        path = self.cache.get(key)
+        if path is None:
+            path = self._find_path(start_node, end_node)
+            self.cache.put(key, path)
+        return list(path)
+    
+    def _find_path(self, start_node, end_node):
+        """
+        Uncached find_path.
+        """
         # TODO: Implement this method
         # 1. Check if start_node or end_node is None, return empty list if either is
         # 2. Reset visited status of all nodes
@@ -133,10 +379,11 @@ class BFS:
         if start_node is None or end_node is None:
             return []
 
-        visited = []
+        stamps, generation = self._begin_visit()
+        index = self._index
         queue = deque()
         queue.append(start_node)
-        visited.append(start_node)
+        stamps[index(start_node)] = generation
         parentMap = {}
         found = False
         parentMap[start_node] = None
@@ -148,11 +395,12 @@ class BFS:
                 found = True
                 break;
 
-            for neighbor_node in current.neighbors:
-                if neighbor_node not in visited:
+            for neighbor_node in self._neighbors(current):
+                i = index(neighbor_node)
+                if stamps[i] != generation:
                     parentMap[neighbor_node] = current
                     queue.append(neighbor_node)
-                    visited.append(neighbor_node)
+                    stamps[i] = generation
 
         if not found:
             return []
@@ -160,22 +408,373 @@ class BFS:
 
         path = []
         while current != None:
-            path.insert(0, current.value)
+            path.insert(0, self._value(current))
+            current = parentMap[current]
+
+        return path
+    
+    def find_path_by_value(self, start_value, end_value):
+        """
+        Find a shortest path between nodes identified by their values.
+        
+        The search starts from the first node holding start_value and stops at
+        the nearest node holding end_value. Both are resolved through the value
+        index when the graph has one.
+        
+        Args:
+            start_value: Value of the starting node
+            end_value: Value of the target node
+            
+        Returns:
+            List of values along the path (same format as find_path), or empty
+            list if either value is missing or no path exists
+        """
+        starts = self.find_nodes(start_value)
+        targets = self.find_nodes(end_value)
+        if len(starts) == 0 or len(targets) == 0:
+            return []
+
+        index = self._index
+        target_ids = {index(node) for node in targets}
+        stamps, generation = self._begin_visit()
+        current = starts[0]
+        stamps[index(current)] = generation
+        parentMap = {current: None}
+        queue = deque()
+        queue.append(current)
+        found = index(current) in target_ids
+
+        while not found and len(queue) != 0:
+            parent = queue.popleft()
+            for neighbor_node in self._neighbors(parent):
+                i = index(neighbor_node)
+                if stamps[i] != generation:
+                    stamps[i] = generation
+                    parentMap[neighbor_node] = parent
+                    if i in target_ids:
+                        current = neighbor_node
+                        found = True
+                        break
+                    queue.append(neighbor_node)
+
+        if not found:
+            return []
+
+        path = []
+        while current is not None:
+            path.append(self._value(current))
             current = parentMap[current]
+        path.reverse()
+        return path
+    
+    def find_path_bidirectional(self, start_node, end_node):
+        """
+        Find a shortest path between start_node and end_node by searching from both ends.
+        
+        Each round expands one whole level of whichever side has the smaller
+        frontier. The first node reached by both searches joins the two
+        parent maps into a shortest path. In a directed graph the search from
+        end_node follows incoming edges.
+        
+        Args:
+            start_node: Starting node
+            end_node: Target node
+            
+        Returns:
+            List of values along the path (same format as find_path), or empty
+            list if no path exists
+        """
+        if start_node is None or end_node is None:
+            return []
+
+        forward = {start_node: None}  # Parent of each node reached from start_node
+        backward = {end_node: None}  # Parent of each node reached from end_node
+        forward_frontier = [start_node]
+        backward_frontier = [end_node]
+        meeting = start_node if start_node == end_node else None
+
+        while meeting is None and len(forward_frontier) > 0 and len(backward_frontier) > 0:
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, parents, other = forward_frontier, forward, backward
+                neighbors = self._neighbors
+            else:
+                frontier, parents, other = backward_frontier, backward, forward
+                neighbors = self._predecessors
 
+            next_frontier = []
+            for current in frontier:
+                for neighbor_node in neighbors(current):
+                    if neighbor_node not in parents:
+                        parents[neighbor_node] = current
+                        next_frontier.append(neighbor_node)
+                        if neighbor_node in other:
+                            meeting = neighbor_node
+                            break
+                if meeting is not None:
+                    break
+
+            if parents is forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        if meeting is None:
+            return []
+
+        path = []
+        current = meeting
+        while current is not None:
+            path.append(self._value(current))
+            current = forward[current]
+        path.reverse()
+        current = backward[meeting]
+        while current is not None:
+            path.append(self._value(current))
+            current = backward[current]
         return path
     
-    def find_level(self, start_node, target_value):
+    def weighted_distances(self, start_node, method="dijkstra", end_node=None, max_weight=None):
+        """
+        Compute the weighted distance and shortest-path parent of every node
+        reachable from start_node.
+        
+        Args:
+            start_node: Starting node
+            method: "dijkstra" for any non-negative weights (binary heap with
+                lazy deletion: improved nodes are pushed again and stale
+                entries skipped when popped), "zero_one" for weights 0 and 1
+                (deque, 0-weight edges go to the front), or "dial" for small
+                non-negative integer weights (circular array of
+                max weight + 1 buckets, one per distance)
+            end_node: Optional node at which to stop once its distance is final
+            max_weight: Largest edge weight, which sizes Dial's buckets; found
+                by scanning every edge when not given
+            
+        Returns:
+            Tuple of (distances, parents) arrays indexed by node id.
+            distances[i] is float("inf") for unreachable nodes; parents[i] is
+            the id of the previous node on a shortest path, or -1.
+        """
+        if method not in ("dijkstra", "zero_one", "dial"):
+            raise ValueError("method must be 'dijkstra', 'zero_one' or 'dial'")
+        nodes = self.get_nodes()
+        n = len(nodes)
+        distances = array("d", [float("inf")]) * n
+        parents = array("q", [-1]) * n
+        if start_node is None:
+            return distances, parents
+
+        edges = self._edges
+        index = self._index
+        source = index(start_node)
+        target = -1 if end_node is None else index(end_node)
+        distances[source] = 0
+        done = bytearray(n)
+
+        if method == "dijkstra":
+            heap = [(0, source)]
+            while len(heap) > 0:
+                distance, u = heappop(heap)
+                if done[u]:
+                    continue
+                done[u] = 1
+                if u == target:
+                    break
+                for neighbor_node, weight in edges(nodes[u]):
+                    if weight < 0:
+                        raise ValueError("Dijkstra needs non-negative weights")
+                    v = index(neighbor_node)
+                    if distance + weight < distances[v]:
+                        distances[v] = distance + weight
+                        parents[v] = u
+                        heappush(heap, (distance + weight, v))
+
+        elif method == "zero_one":
+            queue = deque([source])
+            while len(queue) > 0:
+                u = queue.popleft()
+                if done[u]:
+                    continue
+                done[u] = 1
+                if u == target:
+                    break
+                for neighbor_node, weight in edges(nodes[u]):
+                    if weight != 0 and weight != 1:
+                        raise ValueError("0-1 BFS needs weights 0 and 1")
+                    v = index(neighbor_node)
+                    if distances[u] + weight < distances[v]:
+                        distances[v] = distances[u] + weight
+                        parents[v] = u
+                        if weight == 0:
+                            queue.appendleft(v)
+                        else:
+                            queue.append(v)
+
+        else:
+            if max_weight is None:
+                max_weight = max((weight for node in nodes for _, weight in edges(node)), default=0)
+            buckets = [[] for _ in range(int(max_weight) + 1)]
+            buckets[0].append(source)
+            pending = 1
+            distance = 0
+            while pending > 0:
+                bucket = buckets[distance % len(buckets)]
+                while len(bucket) > 0:
+                    u = bucket.pop()
+                    pending -= 1
+                    if done[u] or distances[u] != distance:
+                        continue
+                    done[u] = 1
+                    if u == target:
+                        return distances, parents
+                    for neighbor_node, weight in edges(nodes[u]):
+                        if weight < 0 or weight > max_weight or weight != int(weight):
+                            raise ValueError("Dial's algorithm needs integer weights from 0 to max_weight")
+                        v = index(neighbor_node)
+                        if distance + weight < distances[v]:
+                            distances[v] = distance + weight
+                            parents[v] = u
+                            buckets[int(distance + weight) % len(buckets)].append(v)
+                            pending += 1
+                distance += 1
+        return distances, parents
+    
+    def find_weighted_path(self, start_node, end_node, method="dijkstra"):
+        """
+        Find a path of least total weight between start_node and end_node.
+        
+        Args:
+            start_node: Starting node
+            end_node: Target node
+            method: "dijkstra", "zero_one" or "dial"; see weighted_distances
+            
+        Returns:
+            List of values along the path (same format as find_path), or empty
+            list if no path exists
+        """
+        if start_node is None or end_node is None:
+            return []
+        distances, parents = self.weighted_distances(start_node, method, end_node)
+        if distances[self._index(end_node)] == float("inf"):
+            return []
+        return self._trace_path(parents, self._index(end_node))
+    
+    def _trace_path(self, parents, end):
+        """
+        Follow parent ids back from a node id to the root of the search.
+        
+        Returns:
+            List of values from the root to the node
+        """
+        nodes = self.get_nodes()
+        path = []
+        while end != -1:
+            path.append(self._value(nodes[end]))
+            end = parents[end]
+        path.reverse()
+        return path
+    
+    def find_path_astar(self, start_node, end_node, heuristic=euclidean):
+        """
+        Find a path of least total weight between start_node and end_node with A*.
+        
+        Nodes are expanded in order of weight so far plus the heuristic's
+        estimate of the weight left, so the search heads towards end_node
+        instead of growing evenly in every direction. Ties go to the node
+        furthest from start_node. Edges without a weight count as 1. Nodes
+        without coordinates get an estimate of 0, and a node is expanded
+        again if a lighter path to it turns up later, so the path is shortest
+        whenever the heuristic never overestimates.
+        
+        Args:
+            start_node: Starting node
+            end_node: Target node; it must have coordinates
+            heuristic: Callable taking the coordinates of a node and of end_node
+                and returning a lower bound on the weight of the path between
+                them (see the heuristics module). Searches expand each node at
+                most once if the bound also never drops by more than an
+                edge's weight along that edge.
+            
+        Returns:
+            Tuple of (path, expanded): the list of values along the path (same
+            format as find_path, empty if no path exists) and the number of
+            nodes taken off the open set
+        """
+        if start_node is None or end_node is None:
+            return [], 0
+
+        nodes = self.get_nodes()
+        n = len(nodes)
+        edges = self._edges
+        index = self._index
+        coordinates = self.coordinates or []
+        source = index(start_node)
+        target = index(end_node)
+        goal = coordinates[target] if target < len(coordinates) else None
+        if goal is None:
+            raise ValueError("end_node has no coordinates")
+
+        def estimate(i):
+            position = coordinates[i] if i < len(coordinates) else None
+            return 0 if position is None else heuristic(position, goal)
+
+        distances = array("d", [float("inf")]) * n
+        parents = array("q", [-1]) * n
+        distances[source] = 0
+        heap = [(estimate(source), 0, source)]
+        expanded = 0
+        while len(heap) > 0:
+            _, distance, u = heappop(heap)
+            distance = -distance
+            if distance > distances[u]:
+                continue  # A lighter path to u was found after this entry was pushed
+            expanded += 1
+            if u == target:
+                return self._trace_path(parents, target), expanded
+            for neighbor_node, weight in edges(nodes[u]):
+                v = index(neighbor_node)
+                if distance + weight < distances[v]:
+                    distances[v] = distance + weight
+                    parents[v] = u
+                    heappush(heap, (distance + weight + estimate(v), -(distance + weight), v))
+        return [], expanded
+    
+    def find_level(self, start_node, target_value, value_index=None):
         """
         Find the level (distance) of a node with target_value from start_node.
         
+        Each node is tested once, when it is discovered, and the search stops
+        at the first match instead of finishing the level.
+        
         Args:
             start_node: Starting node
             target_value: Value to search for
+            value_index: Optional mapping from value to the list of nodes holding
+                it. The target is then resolved up front: a value that is not in
+                the graph costs O(1), and nodes are matched by id instead of by
+                comparing values. Defaults to the graph's own value index.
             
         Returns:
             Level of the target node, or -1 if not found
         """
+        if start_node is None:
+            return -1
+        if self.cache is None or (value_index is not None and value_index is not self.value_index):
+            return self._find_level(start_node, target_value, value_index)
+        try:
+            key = ("level", self._index(start_node), target_value)
+            level = self.cache.get(key)
+        except TypeError:  # Unhashable target values are not cached
+            return self._find_level(start_node, target_value, value_index)
+        if level is None:
+            level = self._find_level(start_node, target_value, value_index)
+            self.cache.put(key, level)
+        return level
+    
+    def _find_level(self, start_node, target_value, value_index=None):
+        """
+        Uncached find_level.
+        """
         # TODO: Implement this method
         # 1. Check if start_node is None, return -1 if it is
         # 2. Reset visited status of all nodes
@@ -192,74 +791,418 @@ class BFS:
         if start_node == None:
             return -1
 
+        index = self._index
+        value = self._value
+        target_ids = None
+        if value_index is None:
+            value_index = self.value_index
+        if value_index is not None:
+            targets = value_index.get(target_value)
+            if not targets:
+                return -1
+            target_ids = {index(node) for node in targets}
+            if index(start_node) in target_ids:
+                return 0
+        elif value(start_node) == target_value:
+            return 0
+
+        stamps, generation = self._begin_visit()
         queue = deque()
-        visited = []
 
         queue.append(start_node)
-        visited.append(start_node)
+        stamps[index(start_node)] = generation
 
         level = 0
 
         while len(queue) > 0:
+            level += 1
             level_size = len(queue)
             for i in range(level_size):
                 current = queue.popleft()
 
-                for neighbor_node in current.neighbors:
-                    if current.value == target_value:
-                        return level
-                    if neighbor_node not in visited:
+                for neighbor_node in self._neighbors(current):
+                    j = index(neighbor_node)
+                    if stamps[j] != generation:
+                        if target_ids is None:
+                            if value(neighbor_node) == target_value:
+                                return level
+                        elif j in target_ids:
+                            return level
                         queue.append(neighbor_node)
-                        visited.append(neighbor_node)
-            level += 1
+                        stamps[j] = generation
         return -1
+    
+    def bfs_levels(self, start_node, direction="auto", alpha=14, beta=24):
+        """
+        Compute the level and BFS-tree parent of every node reachable from start_node.
+        
+        Each level is expanded either top-down (the frontier scans its edges) or
+        bottom-up (every unvisited node looks for a neighbor in the frontier and
+        stops at the first one; in a directed graph it looks along its incoming
+        edges). With direction="auto" the choice follows
+        Beamer's heuristic: switch to bottom-up once the frontier's edges exceed
+        1/alpha of the edges left to explore, and back to top-down once the
+        frontier holds fewer than 1/beta of the nodes.
+        
+        Args:
+            start_node: Starting node
+            direction: "auto", "top_down" or "bottom_up"
+            alpha: Top-down to bottom-up switching threshold
+            beta: Bottom-up to top-down switching threshold
+            
+        Returns:
+            Tuple of (levels, parents) arrays indexed by node id. levels[i] is
+            the distance from start_node (what find_level returns) or -1 if the
+            node is unreachable; parents[i] is the id of the node it was reached
+            from (the previous step of a shortest path) or -1.
+            Levels do not depend on the direction; parents may differ between
+            directions but always form a shortest-path tree.
+        """
+        if direction not in ("auto", "top_down", "bottom_up"):
+            raise ValueError("direction must be 'auto', 'top_down' or 'bottom_up'")
+        nodes = self.get_nodes()
+        n = len(nodes)
+        levels = array("i", [-1]) * n
+        parents = array("q", [-1]) * n
+        if start_node is None:
+            return levels, parents
+
+        neighbors = self._neighbors
+        predecessors = self._predecessors
+        index = self._index
+        levels[index(start_node)] = 0
+        frontier = [start_node]
+        level = 0
+        bottom_up = direction == "bottom_up"
+        unexplored_edges = 0
+        if direction == "auto":
+            unexplored_edges = sum(len(neighbors(node)) for node in nodes)
 
+        while len(frontier) > 0:
+            if direction == "auto":
+                frontier_edges = sum(len(neighbors(node)) for node in frontier)
+                unexplored_edges -= frontier_edges
+                if not bottom_up and frontier_edges > unexplored_edges / alpha:
+                    bottom_up = True
+                elif bottom_up and len(frontier) < n / beta:
+                    bottom_up = False
+
+            next_frontier = []
+            if bottom_up:
+                for v in range(n):
+                    if levels[v] != -1:
+                        continue
+                    for neighbor_node in predecessors(nodes[v]):
+                        i = index(neighbor_node)
+                        if levels[i] == level:
+                            levels[v] = level + 1
+                            parents[v] = i
+                            next_frontier.append(nodes[v])
+                            break
+            else:
+                for current in frontier:
+                    parent = index(current)
+                    for neighbor_node in neighbors(current):
+                        i = index(neighbor_node)
+                        if levels[i] == -1:
+                            levels[i] = level + 1
+                            parents[i] = parent
+                            next_frontier.append(neighbor_node)
+            frontier = next_frontier
+            level += 1
+        return levels, parents
+    
+    def parallel_bfs_levels(self, start_node, processes=None, alpha=14, beta=24):
+        """
+        Compute the same levels and parents as bfs_levels(start_node, "auto",
+        alpha, beta) using a process pool.
+        
+        The graph is copied into shared memory as CSR (converted first when this
+        BFS uses Node objects). Bottom-up levels are split across the workers,
+        one range of node ids each; top-down levels stay in this process.
+        Keep a ParallelBFS open instead when running many queries on one graph.
+        
+        Args:
+            start_node: Starting node
+            processes: Number of worker processes (defaults to the CPU count)
+            alpha: Top-down to bottom-up switching threshold
+            beta: Bottom-up to top-down switching threshold
+            
+        Returns:
+            Tuple of (levels, parents) arrays indexed by node id
+        """
+        graph = self.graph if self.graph is not None else CSRGraph.from_nodes(self.nodes, directed=self.directed)
+        start = None if start_node is None else self._index(start_node)
+        with ParallelBFS(graph, processes) as parallel:
+            return parallel.bfs_levels(start, alpha, beta)
+    
+    def landmark_oracle(self, k=16, strategy="farthest", seed=None):
+        """
+        Precompute BFS levels from k landmarks for O(k) distance queries.
+        
+        Args:
+            k: Number of landmarks
+            strategy: "farthest", "degree" or "random"; see LandmarkOracle
+            seed: Random seed for the "random" strategy
             
+        Returns:
+            A LandmarkOracle for the graph as it is now
+        """
+        return LandmarkOracle(self, k, strategy, seed)
+    
+    def multi_source_bfs(self, sources):
+        """
+        Compute the distance to, and id of, the nearest source for every node.
+        
+        All sources are enqueued at level 0, so a single O(V + E) pass replaces
+        one find_level call per (source, node) pair. Ties go to the source
+        listed first.
+        
+        Args:
+            sources: Iterable of source nodes
+            
+        Returns:
+            Tuple of (distances, nearest) arrays indexed by node id.
+            distances[i] is the distance to the nearest source or -1 if no source
+            reaches the node; nearest[i] is the id of that source or -1.
+        """
+        n = len(self.get_nodes())
+        distances = array("i", [-1]) * n
+        nearest = array("q", [-1]) * n
+        neighbors = self._neighbors
+        index = self._index
+
+        queue = deque()
+        for source in sources:
+            i = index(source)
+            if distances[i] == -1:
+                distances[i] = 0
+                nearest[i] = i
+                queue.append(source)
+
+        while len(queue) != 0:
+            current = queue.popleft()
+            i = index(current)
+            distance = distances[i] + 1
+            source = nearest[i]
+            for neighbor_node in neighbors(current):
+                j = index(neighbor_node)
+                if distances[j] == -1:
+                    distances[j] = distance
+                    nearest[j] = source
+                    queue.append(neighbor_node)
+        return distances, nearest
+    
+    def batched_bfs(self, sources, batch_size=64):
+        """
+        Compute the distance from each of many sources to every node.
+        
+        Sources are processed batch_size at a time. Within a batch every node
+        carries one bit per source in a Python int, so a single scan of an edge
+        advances all sources whose frontier crosses it, instead of one BFS per
+        source.
+        
+        Args:
+            sources: Iterable of source nodes
+            batch_size: Number of sources packed into each bitset
+            
+        Returns:
+            Distance matrix as a list with one array per source, indexed by node
+            id; -1 marks nodes the source cannot reach
+        """
+        nodes = self.get_nodes()
+        n = len(nodes)
+        neighbors = self._neighbors
+        index = self._index
+        sources = list(sources)
+        matrix = []
+
+        for offset in range(0, len(sources), batch_size):
+            batch = sources[offset:offset + batch_size]
+            rows = [array("i", [-1]) * n for _ in batch]
+            seen = [0] * n  # Bit b of seen[i] is set once source b reached node i
+            frontier = {}  # Node id -> bits of the sources that reached it last level
+            for bit, source in enumerate(batch):
+                i = index(source)
+                seen[i] |= 1 << bit
+                frontier[i] = frontier.get(i, 0) | (1 << bit)
+                rows[bit][i] = 0
+
+            level = 0
+            while len(frontier) > 0:
+                level += 1
+                reached = {}
+                for i, bits in frontier.items():
+                    for neighbor_node in neighbors(nodes[i]):
+                        j = index(neighbor_node)
+                        reached[j] = reached.get(j, 0) | bits
+                frontier = {}
+                for j, bits in reached.items():
+                    new = bits & ~seen[j]
+                    if new:
+                        seen[j] |= new
+                        frontier[j] = new
+                        while new:
+                            low = new & -new
+                            rows[low.bit_length() - 1][j] = level
+                            new ^= low
+            matrix.extend(rows)
+        return matrix
+
+            
+    def _rebuild_components(self):
+        """
+        Rebuild the connected components from the adjacency of every node.
+        """
+        index = self._index
+        nodes = self.get_nodes()
+        self.components.reset(len(nodes))  # In place: nodes hold a reference to it
+        for node in nodes:
+            for neighbor_node in self._neighbors(node):
+                self.components.union(index(node), index(neighbor_node))
+    
+    def _current_components(self):
+        """
+        Get the connected components, rebuilding them first if an edge was
+        removed, the backend has not been scanned yet, or nodes were added
+        to the backend directly.
+        
+        Returns:
+            The up-to-date DisjointSet
+        """
+        if self.components.stale or len(self.components) != len(self.get_nodes()):
+            self._rebuild_components()
+        return self.components
+    
     def count_connected_components(self):
         """
         Count the number of connected components in the graph.
         
+        Components are kept in a DisjointSet that add_node and add_edge update,
+        so this costs O(1). In a directed graph they are the weakly connected
+        components. Removing an edge with Node.remove_neighbor, which union-find
+        cannot undo, makes the next query rebuild them in O(V + E); so does
+        the first query on a CSRGraph backend.
+        
         Returns:
             Number of connected components
         """
-        # TODO: Implement this method
-        # 1. Check if there are no nodes, return 0 if there aren't
-        # 2. Reset visited status of all nodes
-        # 3. Initialize a count to 0
-        # 4. For each node in the graph:
-        #    a. If the node is not visited:
-        #       i. Perform BFS traversal starting from this node
-        #          (this will mark all nodes in the component as visited)
-        #       ii. Increment the count
-        # 5. Return the count
-        return 0
+        return self._current_components().count
+    
+    def same_component(self, node1, node2):
+        """
+        Check if two nodes are in the same connected component.
+        
+        Args:
+            node1: First node
+            node2: Second node
+            
+        Returns:
+            True if a path connects them (ignoring edge directions), False otherwise
+        """
+        return self._current_components().same(self._index(node1), self._index(node2))
+    
+    def component_labels(self, method="serial", processes=None):
+        """
+        Label every node with the smallest node id in its connected component.
+        
+        Args:
+            method: "serial" reads the DisjointSet kept by add_edge;
+                "vectorized" runs NumPy label propagation over the CSR arrays;
+                "parallel" merges union-find forests built by a process pool.
+                Object graphs are converted to CSR for the last two.
+            processes: Number of worker processes for "parallel" (defaults to
+                the CPU count)
+            
+        Returns:
+            Array of labels indexed by node id; two nodes are connected (ignoring
+            edge directions) exactly when their labels are equal
+        """
+        if method not in ("serial", "vectorized", "parallel"):
+            raise ValueError("method must be 'serial', 'vectorized' or 'parallel'")
+        if method == "serial":
+            return self._current_components().labels()
+
+        graph = self.graph
+        if graph is None:
+            graph = CSRGraph.from_nodes(self.nodes, directed=self.directed)
+        if method == "vectorized":
+            return label_components(graph)
+        with ParallelBFS(graph, processes) as parallel:
+            return parallel.component_labels()
     
-    def is_bipartite(self, start_node):
+    def two_coloring(self):
+        """
+        Two-color every connected component of the graph, if possible.
+        
+        Each uncolored node starts a BFS that gives every newly reached node the
+        opposite color of the node it was reached from. An edge between two
+        nodes of the same color closes an odd cycle, which is rebuilt from the
+        BFS tree. Edge directions are ignored. Colors take one byte per node
+        and BFS parents eight.
+        
+        Returns:
+            Tuple of (colors, cycle): (bytearray of colors 0 or 1 indexed by
+            node id, None) if the graph is bipartite, otherwise (None, values
+            along an odd cycle in edge order)
+        """
+        nodes = self.get_nodes()
+        n = len(nodes)
+        index = self._index
+        adjacency = (self._neighbors,) if not self.directed else (self._neighbors, self._predecessors)
+        colors = bytearray(b"\x02") * n  # 2 = not colored yet
+        parents = array("q", [-1]) * n
+        for first in range(n):
+            if colors[first] != 2:
+                continue
+            colors[first] = 0
+            queue = deque([first])
+            while len(queue) > 0:
+                u = queue.popleft()
+                color = colors[u]
+                for neighbors in adjacency:
+                    for neighbor_node in neighbors(nodes[u]):
+                        v = index(neighbor_node)
+                        if colors[v] == 2:
+                            colors[v] = color ^ 1
+                            parents[v] = u
+                            queue.append(v)
+                        elif colors[v] == color:
+                            return None, self._odd_cycle(u, v, parents)
+        return colors, None
+    
+    def _odd_cycle(self, u, v, parents):
+        """
+        Rebuild the cycle closed by the edge u -- v from the BFS tree parents.
+        
+        Returns:
+            Values from u up to the common ancestor of u and v, then down to v
+        """
+        ancestors = {}
+        i = u
+        while i != -1:
+            ancestors[i] = len(ancestors)
+            i = parents[i]
+        down = []
+        i = v
+        while i not in ancestors:
+            down.append(i)
+            i = parents[i]
+        up = list(ancestors)[:ancestors[i] + 1]
+        nodes = self.get_nodes()
+        return [self._value(nodes[j]) for j in up + down[::-1]]
+    
+    def is_bipartite(self, start_node=None):
         """
         Check if the graph is bipartite (can be colored with two colors).
         
+        Every component is checked, not just the one holding start_node;
+        see two_coloring for the coloring or an odd cycle.
+        
         Args:
-            start_node: Starting node for the check
+            start_node: Unused; kept so existing callers still work
             
         Returns:
             True if the graph is bipartite, False otherwise
         """
-        # TODO: Implement this method
-        # 1. Check if start_node is None, return True if it is
-        # 2. Reset visited status of all nodes
-        # 3. Create a dictionary to store colors (True/False) for each node
-        # 4. Assign a color (True) to the start_node
-        # 5. Create a queue and add the start_node to it
-        # 6. Mark the start_node as visited
-        # 7. While the queue is not empty:
-        #    a. Dequeue a node
-        #    b. Get the color of the current node
-        #    c. For each neighbor:
-        #       i. If the neighbor is not colored:
-        #          - Assign the opposite color to the neighbor
-        #          - Mark it as visited
-        #          - Enqueue it
-        #       ii. If the neighbor is already colored with the same color as the current node:
-        #           - Return False (not bipartite)
-        # 8. Return True if all checks pass
-        return True
+        return self.two_coloring()[1] is None
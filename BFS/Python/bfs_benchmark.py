@@ -0,0 +1,279 @@
+"""
+Benchmarks for the BFS implementation.
+Run them with: python3 -m bfs_benchmark (from BFS/Python)
+"""
+import os
+import random
+import time
+import tracemalloc
+from collections import deque
+from array import array
+from bfs import BFS
+from node import Node, SlottedNode
+from graph_loader import GraphLoader
+from csr_graph import CSRGraph
+from parallel_bfs import ParallelBFS
+import component_labels
+import heuristics
+
+def build_graph(bfs, count):
+    """
+    Build a path graph 0 -- 1 -- ... -- count-1.
+    
+    Returns:
+        The graph
+    """
+    previous = None
+    for i in range(count):
+        node = bfs.add_node(i)
+        if previous is not None:
+            bfs.add_edge(previous, node)
+        previous = node
+    return bfs
+
+def bytes_per_node(build, count):
+    """
+    Measure the memory allocated per node by a structure builder.
+    
+    Args:
+        build: Function that builds and returns a structure with count nodes
+        count: Number of nodes to build
+        
+    Returns:
+        Bytes allocated per node, including the container's own bookkeeping
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    structure = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return (after - before) / count
+
+def benchmark_node_memory(count=100000):
+    """
+    Compare the memory used per node with Node and SlottedNode.
+    """
+    print("\n=== Node Memory ({} nodes) ===".format(count))
+    results = {}
+    for node_class in (Node, SlottedNode):
+        results[node_class] = bytes_per_node(lambda n: build_graph(BFS(node_class=node_class), n), count)
+        print("{}: {:.0f} bytes per node".format(node_class.__name__, results[node_class]))
+    print("SlottedNode saves {:.0f} bytes per node".format(results[Node] - results[SlottedNode]))
+
+def traversal_labels(bfs):
+    """
+    Label components with one BFS per unlabeled node, the way the reference
+    count_connected_components walks the graph; the baseline for
+    benchmark_component_labels.
+    """
+    nodes = bfs.get_nodes()
+    labels = array("q", [-1]) * len(nodes)
+    for first in nodes:
+        if labels[first] != -1:
+            continue
+        labels[first] = first
+        queue = deque([first])
+        while len(queue) > 0:
+            current = queue.popleft()
+            for neighbor_node in bfs.graph.neighbors(current):
+                if labels[neighbor_node] == -1:
+                    labels[neighbor_node] = first
+                    queue.append(neighbor_node)
+    return labels
+
+def benchmark_component_labels(nodes=10 ** 6, edges=10 ** 7, processes=None):
+    """
+    Compare component labeling by repeated BFS, serial union-find, NumPy label
+    propagation and parallel union-find on a random CSR graph.
+    
+    Args:
+        nodes: Number of nodes
+        edges: Number of random edges
+        processes: Worker processes for the parallel method (defaults to the CPU count)
+    """
+    print("\n=== Component Labels ({} nodes, {} edges) ===".format(nodes, edges))
+    rng = random.Random(0)
+    src = array("q", (rng.randrange(nodes) for _ in range(edges)))
+    dst = array("q", (rng.randrange(nodes) for _ in range(edges)))
+    graph = GraphLoader().load_arrays(src, dst, range(nodes))
+    
+    bfs = BFS(graph)
+    
+    timings = []
+    start = time.perf_counter()
+    expected = traversal_labels(bfs)
+    timings.append(("BFS traversals", time.perf_counter() - start))
+    start = time.perf_counter()
+    labels = bfs.component_labels()  # Builds the DisjointSet from the existing edges
+    timings.append(("serial union-find, built from the edges", time.perf_counter() - start))
+    start = time.perf_counter()
+    bfs.component_labels()
+    timings.append(("serial union-find, kept up to date by add_edge", time.perf_counter() - start))
+    methods = ["parallel"] if component_labels.numpy is None else ["vectorized", "parallel"]
+    for method in methods:
+        start = time.perf_counter()
+        result = bfs.component_labels(method, processes)
+        timings.append((method, time.perf_counter() - start))
+        if result != labels:
+            print("{} labels differ from the serial labels".format(method))
+    if expected != labels:
+        print("BFS traversal labels differ from the serial labels")
+    
+    print("{} components".format(bfs.count_connected_components()))
+    for name, seconds in timings:
+        print("{}: {:.2f} s ({:.1f}x)".format(name, seconds, timings[0][1] / seconds))
+
+def benchmark_parallel_bfs(nodes=200000, edges=2 * 10 ** 6, processes=(1, 2, 4)):
+    """
+    Compare BFS.bfs_levels with ParallelBFS at several process counts on a
+    random CSR graph. The pool is started before timing, as for a service
+    that keeps a ParallelBFS open between queries.
+    
+    Args:
+        nodes: Number of nodes
+        edges: Number of random edges
+        processes: Process counts to try
+    """
+    print("\n=== Parallel BFS ({} nodes, {} edges, {} CPUs) ===".format(nodes, edges, os.cpu_count()))
+    rng = random.Random(0)
+    src = array("q", (rng.randrange(nodes) for _ in range(edges)))
+    dst = array("q", (rng.randrange(nodes) for _ in range(edges)))
+    bfs = BFS(GraphLoader().load_arrays(src, dst, range(nodes)))
+    
+    start = time.perf_counter()
+    expected = bfs.bfs_levels(0)[0]
+    serial = time.perf_counter() - start
+    print("bfs_levels: {:.2f} s".format(serial))
+    for count in processes:
+        with ParallelBFS(bfs.graph, count) as parallel:
+            start = time.perf_counter()
+            levels = parallel.bfs_levels(0)[0]
+            seconds = time.perf_counter() - start
+        if levels != expected:
+            print("{} processes: levels differ from bfs_levels".format(count))
+        print("ParallelBFS, {} processes: {:.2f} s ({:.2f}x)".format(count, seconds, serial / seconds))
+
+def benchmark_weighted_paths(nodes=10 ** 5, degree=4):
+    """
+    Compare Dijkstra, 0-1 BFS and Dial's buckets on random CSR graphs with
+    different weight distributions.
+    
+    Args:
+        nodes: Number of nodes
+        degree: Random edges per node
+    """
+    print("\n=== Weighted Paths ({} nodes, {} edges) ===".format(nodes, nodes * degree))
+    rng = random.Random(0)
+    distributions = [
+        ("unit weights", lambda: 1, 1, ("dijkstra", "zero_one", "dial")),
+        ("weights 0 or 1", lambda: rng.randrange(2), 1, ("dijkstra", "zero_one", "dial")),
+        ("integer weights 1-10", lambda: rng.randint(1, 10), 10, ("dijkstra", "dial")),
+        ("integer weights 1-1000", lambda: rng.randint(1, 1000), 1000, ("dijkstra", "dial")),
+    ]
+    for name, weight, max_weight, methods in distributions:
+        graph = CSRGraph()
+        for i in range(nodes):
+            graph.add_node(i)
+        for _ in range(nodes * degree):
+            graph.add_edge(rng.randrange(nodes), rng.randrange(nodes), weight())
+        graph.compact()
+        bfs = BFS(graph)
+        
+        results = []
+        for method in methods:
+            start = time.perf_counter()
+            distances = bfs.weighted_distances(0, method, max_weight=max_weight)[0]
+            results.append((method, time.perf_counter() - start, distances))
+        if any(distances != results[0][2] for _, _, distances in results):
+            print("Distances differ between methods")
+        print("{}: {}".format(name, ", ".join(
+            "{} {:.2f} s".format(method, seconds) for method, seconds, _ in results)))
+
+def build_grid(bfs, size, walls=()):
+    """
+    Build a size x size grid of 4-neighbor moves with (row, column) values
+    and coordinates, leaving out the cells in walls.
+    
+    Returns:
+        Dictionary from (row, column) to node
+    """
+    cells = {}
+    for row in range(size):
+        for column in range(size):
+            if (row, column) not in walls:
+                cells[row, column] = bfs.add_node((row, column), (row, column))
+    for (row, column), node in cells.items():
+        for neighbor in ((row + 1, column), (row, column + 1)):
+            if neighbor in cells:
+                bfs.add_edge(node, cells[neighbor])
+    return cells
+
+def benchmark_astar(size=300):
+    """
+    Compare A* with the Manhattan heuristic against the zero heuristic
+    (uniform-cost search, which expands nodes in plain BFS order on these
+    unit-weight grids) and against BFS.find_path.
+    """
+    print("\n=== A* Search ({0} x {0} grids) ===".format(size))
+    middle = size // 2
+    grids = [
+        ("open grid", set()),
+        ("wall with a gap at the bottom", {(row, middle) for row in range(size - 1)}),
+    ]
+    for name, walls in grids:
+        bfs = BFS()
+        cells = build_grid(bfs, size, walls)
+        start, end = cells[0, 0], cells[0, size - 1]
+        results = []
+        for label, heuristic in (("A* Manhattan", heuristics.manhattan), ("uniform-cost", heuristics.zero)):
+            begin = time.perf_counter()
+            path, expanded = bfs.find_path_astar(start, end, heuristic)
+            results.append("{}: {} expanded, {:.3f} s".format(label, expanded, time.perf_counter() - begin))
+        begin = time.perf_counter()
+        bfs.find_path(start, end)
+        results.append("find_path: {:.3f} s".format(time.perf_counter() - begin))
+        print("{} (path of {} nodes): {}".format(name, len(path), "; ".join(results)))
+
+def benchmark_landmark_oracle(size=200, queries=200, k=16):
+    """
+    Compare landmark-oracle distance queries, exact and with slack, against a
+    BFS per query on a grid.
+    """
+    print("\n=== Landmark Oracle ({0} x {0} grid, {1} landmarks, {2} queries) ===".format(size, k, queries))
+    bfs = BFS(CSRGraph())
+    build_grid(bfs, size)
+    nodes = bfs.get_nodes()
+    rng = random.Random(0)
+    pairs = [(nodes[rng.randrange(len(nodes))], nodes[rng.randrange(len(nodes))]) for _ in range(queries)]
+    
+    begin = time.perf_counter()
+    oracle = bfs.landmark_oracle(k)
+    print("precompute: {:.2f} s".format(time.perf_counter() - begin))
+    begin = time.perf_counter()
+    for u, v in pairs:
+        bfs.bfs_levels(u)
+    print("BFS per query: {:.2f} s".format(time.perf_counter() - begin))
+    for tolerance in (0, 2, size):
+        oracle.tight = oracle.fallbacks = 0
+        begin = time.perf_counter()
+        for u, v in pairs:
+            oracle.distance(u, v, tolerance)
+        print("oracle, tolerance {}: {:.3f} s ({} from bounds, {} searched)".format(
+            tolerance, time.perf_counter() - begin, oracle.tight, oracle.fallbacks))
+
+def main():
+    """
+    Main method to run the benchmarks.
+    """
+    print("Running BFS Benchmarks...")
+    benchmark_node_memory()
+    benchmark_component_labels()
+    benchmark_parallel_bfs()
+    benchmark_weighted_paths()
+    benchmark_astar()
+    benchmark_landmark_oracle()
+    print("All benchmarks completed.")
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,16 @@ This class provides methods to test various operations of the BFS algorithm.
 from bfs_template import BFSTemplate
 from bfs_solution import BFSSolution
 from bfs import BFS
+from csr_graph import CSRGraph
+from node import SlottedNode
+from graph_loader import GraphLoader
+from mapped_graph import MappedGraph
+from landmark_oracle import LandmarkOracle
+import graph_loader
+import component_labels
+import heuristics
+import os
+import tempfile
 
 # Uncomment the line below to use your implementation
 # BFS = BFSTemplate
@@ -277,6 +287,1126 @@ def test_bipartite():
     else:
         print("FAIL: Triangle graph is considered bipartite, but should not be")
 
+def test_csr_backend():
+    """
+    Test the BFS operations on the CSR graph backend.
+    """
+    print("\n=== Testing CSR Backend ===")
+    bfs = BFS(CSRGraph())
+    
+    # Same graph as above, built through add_node/add_edge
+    # 1 -- 2 -- 5
+    # |    |
+    # 3 -- 4
+    node1 = bfs.add_node(1)
+    node2 = bfs.add_node(2)
+    node3 = bfs.add_node(3)
+    node4 = bfs.add_node(4)
+    node5 = bfs.add_node(5)
+    
+    bfs.add_edge(node1, node2)
+    bfs.add_edge(node1, node3)
+    bfs.add_edge(node2, node4)
+    bfs.add_edge(node2, node5)
+    bfs.add_edge(node3, node4)
+    bfs.add_edge(node1, node2)  # Duplicate edge is ignored
+    
+    result = bfs.bfs_traversal(node1)
+    if result == [1, 2, 3, 4, 5]:
+        print("PASS: CSR BFS traversal matches the object graph order")
+    else:
+        print("FAIL: CSR BFS traversal does not match the object graph order, got", result)
+    
+    path = bfs.find_path(node3, node5)
+    if path == [3, 1, 2, 5]:
+        print("PASS: CSR path from node3 to node5 found")
+    else:
+        print("FAIL: CSR path from node3 to node5 not found correctly, got", path)
+    
+    level = bfs.find_level(node1, 5)
+    if level == 2:
+        print("PASS: CSR level of node5 from node1 is 2")
+    else:
+        print("FAIL: CSR level of node5 from node1 is not 2, got", level)
+    
+    # Bulk-loaded graph gives the same answers
+    graph = CSRGraph.from_edges([1, 2, 3, 4, 5], [(0, 1), (0, 2), (1, 3), (1, 4), (2, 3)], "q")
+    result = BFS(graph).bfs_traversal(0)
+    if result == [1, 2, 3, 4, 5]:
+        print("PASS: Bulk-loaded CSR graph traverses in the same order")
+    else:
+        print("FAIL: Bulk-loaded CSR graph traverses in a different order, got", result)
+    
+    # Converting an object graph keeps neighbor order
+    objects = BFS()
+    a = objects.add_node("a")
+    b = objects.add_node("b")
+    c = objects.add_node("c")
+    objects.add_edge(a, c)
+    objects.add_edge(a, b)
+    result = BFS(CSRGraph.from_nodes(objects.get_nodes())).bfs_traversal(0)
+    if result == objects.bfs_traversal(a):
+        print("PASS: Converted CSR graph keeps neighbor order")
+    else:
+        print("FAIL: Converted CSR graph does not keep neighbor order, got", result)
+
+def test_visited_tracking():
+    """
+    Test that repeated traversals on a large graph share the visited set.
+    """
+    print("\n=== Testing Visited Tracking ===")
+    bfs = BFS()
+    
+    # Path graph 0 -- 1 -- ... -- 19999 would take minutes with list lookups
+    nodes = [bfs.add_node(i) for i in range(20000)]
+    for i in range(len(nodes) - 1):
+        bfs.add_edge(nodes[i], nodes[i + 1])
+    
+    result = bfs.bfs_traversal(nodes[0])
+    if len(result) == 20000 and result[-1] == 19999:
+        print("PASS: BFS traversal visits every node of a 20000-node path")
+    else:
+        print("FAIL: BFS traversal of a 20000-node path is incomplete, got", len(result))
+    
+    # No reset is needed between queries
+    path = bfs.find_path(nodes[100], nodes[105])
+    level = bfs.find_level(nodes[0], 19999)
+    if path == [100, 101, 102, 103, 104, 105] and level == 19999:
+        print("PASS: Consecutive queries do not see each other's visited nodes")
+    else:
+        print("FAIL: Consecutive queries interfere, got", path, level)
+
+def test_direction_optimizing():
+    """
+    Test the direction-optimizing level computation.
+    """
+    print("\n=== Testing Direction-Optimizing BFS ===")
+    bfs = BFS()
+    
+    # Low-diameter graph: a hub joined to 200 leaves, each leaf joined to the next
+    hub = bfs.add_node(0)
+    leaves = [bfs.add_node(i) for i in range(1, 201)]
+    for i, leaf in enumerate(leaves):
+        bfs.add_edge(hub, leaf)
+        if i > 0:
+            bfs.add_edge(leaves[i - 1], leaf)
+    far = bfs.add_node(201)
+    bfs.add_edge(leaves[-1], far)
+    isolated = bfs.add_node(202)
+    
+    start = leaves[50]
+    results = [bfs.bfs_levels(start, direction) for direction in ("top_down", "bottom_up", "auto")]
+    if all(levels == results[0][0] for levels, _ in results):
+        print("PASS: All directions compute the same levels")
+    else:
+        print("FAIL: Directions compute different levels")
+    
+    levels, parents = results[2]
+    expected = [bfs.find_level(start, node.value) for node in bfs.get_nodes()]
+    if list(levels) == expected and levels[far.index] == 3 and levels[isolated.index] == -1:
+        print("PASS: Levels match find_level for every node")
+    else:
+        print("FAIL: Levels do not match find_level")
+    
+    # Parents must form a shortest-path tree
+    nodes = bfs.get_nodes()
+    valid = all(
+        parents[i] == -1 or (nodes[parents[i]] in nodes[i].neighbors and levels[parents[i]] == levels[i] - 1)
+        for i in range(len(nodes))
+    )
+    if valid and parents[start.index] == -1:
+        print("PASS: Parents form a shortest-path tree")
+    else:
+        print("FAIL: Parents do not form a shortest-path tree")
+
+def test_find_path_bidirectional():
+    """
+    Test the bidirectional find path operation.
+    """
+    print("\n=== Testing Bidirectional Find Path ===")
+    bfs = BFS()
+    
+    # 20 x 20 grid; node value is row * 20 + column
+    grid = [[bfs.add_node(row * 20 + col) for col in range(20)] for row in range(20)]
+    for row in range(20):
+        for col in range(20):
+            if col < 19:
+                bfs.add_edge(grid[row][col], grid[row][col + 1])
+            if row < 19:
+                bfs.add_edge(grid[row][col], grid[row + 1][col])
+    
+    path = bfs.find_path_bidirectional(grid[0][0], grid[19][19])
+    expected = bfs.find_path(grid[0][0], grid[19][19])
+    consecutive = all(abs(a - b) in (1, 20) for a, b in zip(path, path[1:]))
+    if len(path) == len(expected) and path[0] == 0 and path[-1] == 399 and consecutive:
+        print("PASS: Bidirectional path across the grid is a shortest path")
+    else:
+        print("FAIL: Bidirectional path across the grid is not a shortest path, got", path)
+    
+    path = bfs.find_path_bidirectional(grid[5][5], grid[5][5])
+    if path == [105]:
+        print("PASS: Bidirectional path from a node to itself is the node")
+    else:
+        print("FAIL: Bidirectional path from a node to itself is wrong, got", path)
+    
+    isolated = bfs.add_node(400)
+    if bfs.find_path_bidirectional(grid[0][0], isolated) == [] and bfs.find_path_bidirectional(None, isolated) == []:
+        print("PASS: No bidirectional path to disconnected or null node")
+    else:
+        print("FAIL: Bidirectional path found to disconnected or null node")
+
+def test_multi_source_bfs():
+    """
+    Test the multi-source BFS operation.
+    """
+    print("\n=== Testing Multi-Source BFS ===")
+    bfs = BFS(CSRGraph())
+    
+    # Path 0 -- 1 -- 2 -- 3 -- 4 -- 5 -- 6 plus an isolated node 7
+    nodes = [bfs.add_node(i * 10) for i in range(8)]
+    for i in range(6):
+        bfs.add_edge(nodes[i], nodes[i + 1])
+    
+    distances, nearest = bfs.multi_source_bfs([nodes[1], nodes[5], nodes[5]])
+    if list(distances) == [1, 0, 1, 2, 1, 0, 1, -1]:
+        print("PASS: Distances to the nearest source are correct")
+    else:
+        print("FAIL: Distances to the nearest source are wrong, got", list(distances))
+    
+    # Node 3 is two steps from both sources; the first listed source wins
+    if list(nearest) == [1, 1, 1, 1, 5, 5, 5, -1]:
+        print("PASS: Nearest sources are correct")
+    else:
+        print("FAIL: Nearest sources are wrong, got", list(nearest))
+    
+    distances, nearest = bfs.multi_source_bfs([])
+    if list(distances) == [-1] * 8 and list(nearest) == [-1] * 8:
+        print("PASS: No sources leaves every node unreached")
+    else:
+        print("FAIL: No sources should leave every node unreached")
+
+def test_batched_bfs():
+    """
+    Test the batched many-source BFS operation.
+    """
+    print("\n=== Testing Batched BFS ===")
+    bfs = BFS()
+    
+    # Ring of 100 nodes with a chord every 7 nodes, plus an isolated node
+    nodes = [bfs.add_node(i) for i in range(100)]
+    for i in range(100):
+        bfs.add_edge(nodes[i], nodes[(i + 1) % 100])
+        if i % 7 == 0:
+            bfs.add_edge(nodes[i], nodes[(i * 3) % 100])
+    bfs.add_node(100)
+    
+    # 70 sources span two batches of 64, and one source is repeated
+    sources = nodes[:70] + [nodes[3]]
+    matrix = bfs.batched_bfs(sources)
+    expected = [bfs.bfs_levels(source, "top_down")[0] for source in sources]
+    if len(matrix) == len(sources) and all(row == levels for row, levels in zip(matrix, expected)):
+        print("PASS: Batched distances match one BFS per source")
+    else:
+        print("FAIL: Batched distances do not match one BFS per source")
+    
+    if matrix[0][100] == -1 and bfs.batched_bfs([]) == []:
+        print("PASS: Unreachable nodes are -1 and no sources give no rows")
+    else:
+        print("FAIL: Unreachable nodes or empty source list handled incorrectly")
+
+def test_parallel_bfs():
+    """
+    Test the parallel level-synchronous BFS operation.
+    """
+    print("\n=== Testing Parallel BFS ===")
+    bfs = BFS()
+    
+    # Ring of 3000 nodes with chords, so middle levels have wide frontiers
+    nodes = [bfs.add_node(i) for i in range(3000)]
+    for i in range(3000):
+        bfs.add_edge(nodes[i], nodes[(i + 1) % 3000])
+        bfs.add_edge(nodes[i], nodes[(i * 7 + 3) % 3000])
+    bfs.add_node(3000)
+    
+    expected = bfs.bfs_levels(nodes[0])
+    results = [bfs.parallel_bfs_levels(nodes[0], processes) for processes in (1, 2, 3)]
+    if all(result == expected for result in results):
+        print("PASS: Parallel BFS levels and parents match the serial BFS for any process count")
+    else:
+        print("FAIL: Parallel BFS levels and parents do not match the serial BFS")
+    
+    # A huge alpha and beta keep every level bottom-up, in the workers
+    expected = bfs.bfs_levels(nodes[5], "auto", 10 ** 6, 10 ** 6)
+    if bfs.parallel_bfs_levels(nodes[5], 2, 10 ** 6, 10 ** 6) == expected:
+        print("PASS: Parallel bottom-up levels match the serial BFS")
+    else:
+        print("FAIL: Parallel bottom-up levels do not match the serial BFS")
+    
+    # Directed graphs are expanded bottom-up along incoming edges, in the
+    # order they were added for Node objects and by source id in a CSRGraph
+    for name, graph, parent in (("Object", BFS(directed=True), 2), ("CSR", BFS(CSRGraph(directed=True)), 1)):
+        nodes = [graph.add_node(i) for i in range(6)]
+        for a, b in ((0, 1), (0, 2), (2, 3), (1, 3), (3, 4), (5, 0), (4, 2)):
+            graph.add_edge(nodes[a], nodes[b])
+        expected = graph.bfs_levels(nodes[0], "auto", 10 ** 6, 10 ** 6)
+        result = graph.parallel_bfs_levels(nodes[0], 2, 10 ** 6, 10 ** 6)
+        if result == expected and list(result[0]) == [0, 1, 1, 2, 3, -1] and list(result[1]) == [-1, 0, 0, parent, 3, -1]:
+            print("PASS: {} directed parallel BFS follows edge directions".format(name))
+        else:
+            print("FAIL: {} directed parallel BFS is wrong:".format(name), result, expected)
+    
+    levels, parents = bfs.parallel_bfs_levels(None, processes=1)
+    if list(levels) == [-1] * 3001 and list(parents) == [-1] * 3001:
+        print("PASS: Parallel BFS with null start node reaches nothing")
+    else:
+        print("FAIL: Parallel BFS with null start node reached nodes")
+
+def test_iter_bfs():
+    """
+    Test the streaming BFS traversal.
+    """
+    print("\n=== Testing Streaming BFS ===")
+    bfs = BFS()
+    
+    # 1 -- 2 -- 5
+    # |    |
+    # 3 -- 4
+    node1 = bfs.add_node(1)
+    node2 = bfs.add_node(2)
+    node3 = bfs.add_node(3)
+    node4 = bfs.add_node(4)
+    node5 = bfs.add_node(5)
+    
+    bfs.add_edge(node1, node2)
+    bfs.add_edge(node1, node3)
+    bfs.add_edge(node2, node4)
+    bfs.add_edge(node2, node5)
+    bfs.add_edge(node3, node4)
+    
+    result = list(bfs.iter_bfs(node1))
+    expected = [(1, 0, None), (2, 1, 1), (3, 1, 1), (4, 2, 2), (5, 2, 2)]
+    if result == expected and [value for value, _, _ in result] == bfs.bfs_traversal(node1):
+        print("PASS: Streaming BFS yields values, levels and parents in BFS order")
+    else:
+        print("FAIL: Streaming BFS yields the wrong sequence, got", result)
+    
+    # Other queries can run while the generator is suspended
+    stream = bfs.iter_bfs(node1)
+    first = [next(stream), next(stream)]
+    bfs.bfs_traversal(node5)
+    rest = list(stream)
+    if first + rest == expected:
+        print("PASS: Streaming BFS is unaffected by queries run in between")
+    else:
+        print("FAIL: Streaming BFS was disturbed by another query, got", first + rest)
+    
+    # Only three levels of ids are kept in an undirected graph, which must
+    # still yield each node of a 10 x 10 grid once
+    edges = [(u, u + 1) for u in range(100) if u % 10 != 9] + [(u, u + 10) for u in range(90)]
+    grid = BFS(CSRGraph.from_edges(range(100), edges))
+    result = list(grid.iter_bfs(0))
+    if [value for value, _, _ in result] == grid.bfs_traversal(0) and \
+            all(level == value // 10 + value % 10 for value, level, _ in result):
+        print("PASS: Streaming BFS yields each node of a grid once, at its level")
+    else:
+        print("FAIL: Streaming BFS on a grid yields the wrong sequence")
+    
+    # A directed edge can point back to any earlier level: 0 -> 1 -> 2 -> 3 -> 0
+    cycle = BFS(CSRGraph.from_edges(range(4), [(0, 1), (1, 2), (2, 3), (3, 0), (3, 1)], directed=True))
+    result = list(cycle.iter_bfs(0))
+    if result == [(0, 0, None), (1, 1, 0), (2, 2, 1), (3, 3, 2)]:
+        print("PASS: Streaming BFS does not revisit earlier levels of a directed graph")
+    else:
+        print("FAIL: Streaming BFS revisited a directed graph, got", result)
+    
+    if list(bfs.iter_bfs(None)) == []:
+        print("PASS: Streaming BFS with null start node yields nothing")
+    else:
+        print("FAIL: Streaming BFS with null start node yields nodes")
+
+def test_find_level_early_exit():
+    """
+    Test the find level operation on nodes without neighbors and with a value index.
+    """
+    print("\n=== Testing Find Level Early Exit ===")
+    bfs = BFS()
+    
+    # 1 -- 2 -- 3, plus an isolated node 4 and a second node holding 3
+    node1 = bfs.add_node(1)
+    node2 = bfs.add_node(2)
+    node3 = bfs.add_node(3)
+    node4 = bfs.add_node(4)
+    bfs.add_edge(node1, node2)
+    bfs.add_edge(node2, node3)
+    
+    if bfs.find_level(node4, 4) == 0 and bfs.find_level(node1, 1) == 0:
+        print("PASS: Start node matches at level 0, even without neighbors")
+    else:
+        print("FAIL: Start node does not match at level 0")
+    
+    other3 = bfs.add_node(3)
+    bfs.add_edge(node1, other3)
+    value_index = {}
+    for node in bfs.get_nodes():
+        value_index.setdefault(node.value, []).append(node)
+    
+    if bfs.find_level(node3, 3, value_index) == 0 and bfs.find_level(node2, 3, value_index) == 1:
+        print("PASS: Value index finds the nearest of duplicate targets")
+    else:
+        print("FAIL: Value index does not find the nearest target")
+    
+    if bfs.find_level(node1, 7, value_index) == -1 and bfs.find_level(node1, 4, value_index) == -1:
+        print("PASS: Value index rejects missing and unreachable values")
+    else:
+        print("FAIL: Value index found a missing or unreachable value")
+
+def test_value_index():
+    """
+    Test value lookups through the value index.
+    """
+    print("\n=== Testing Value Index ===")
+    for bfs in (BFS(index_values=True), BFS(CSRGraph(), index_values=True)):
+        # "a" -- "b" -- "c" -- "b"(second)
+        a = bfs.add_node("a")
+        b = bfs.add_node("b")
+        c = bfs.add_node("c")
+        b2 = bfs.add_node("b")
+        bfs.add_edge(a, b)
+        bfs.add_edge(b, c)
+        bfs.add_edge(c, b2)
+        backend = "CSR" if bfs.graph is not None else "object"
+        
+        if bfs.find_nodes("b") == [b, b2] and bfs.has_value("c") and not bfs.has_value("z"):
+            print("PASS: Value index finds duplicate values on the", backend, "backend")
+        else:
+            print("FAIL: Value index lookups are wrong on the", backend, "backend")
+        
+        if bfs.find_path_by_value("c", "b") == ["c", "b"] and bfs.find_level(a, "c") == 2:
+            print("PASS: Path and level by value use the index on the", backend, "backend")
+        else:
+            print("FAIL: Path or level by value is wrong on the", backend, "backend")
+        
+        bfs.set_value(b2, "d")
+        if bfs.find_nodes("b") == [b] and bfs.find_nodes("d") == [b2] and bfs.find_level(a, "d") == 3:
+            print("PASS: Value index follows set_value on the", backend, "backend")
+        else:
+            print("FAIL: Value index is stale after set_value on the", backend, "backend")
+        
+        bfs.clear()
+        if not bfs.has_value("a") and bfs.find_path_by_value("a", "c") == []:
+            print("PASS: Value index is emptied by clear on the", backend, "backend")
+        else:
+            print("FAIL: Value index still has entries after clear on the", backend, "backend")
+    
+    # Node.set_value keeps the index in sync too
+    bfs = BFS(index_values=True)
+    node = bfs.add_node(1)
+    node.set_value(2)
+    if bfs.find_nodes(2) == [node] and not bfs.has_value(1):
+        print("PASS: Node.set_value updates the value index")
+    else:
+        print("FAIL: Node.set_value does not update the value index")
+
+def test_slotted_nodes():
+    """
+    Test the BFS operations on SlottedNode nodes.
+    """
+    print("\n=== Testing Slotted Nodes ===")
+    bfs = BFS(index_values=True, node_class=SlottedNode)
+    node1 = bfs.add_node(1)
+    node2 = bfs.add_node(2)
+    node3 = bfs.add_node(3)
+    bfs.add_edge(node1, node2)
+    bfs.add_edge(node2, node3)
+    
+    if isinstance(node1, SlottedNode) and not hasattr(node1, "__dict__"):
+        print("PASS: Graph stores SlottedNode nodes without a __dict__")
+    else:
+        print("FAIL: Graph does not store SlottedNode nodes")
+    
+    node3.set_value(4)
+    if bfs.bfs_traversal(node1) == [1, 2, 4] and bfs.find_level(node1, 4) == 2:
+        print("PASS: BFS operations work with SlottedNode")
+    else:
+        print("FAIL: BFS operations do not work with SlottedNode")
+
+def test_neighbor_order():
+    """
+    Test that neighbors stay unique and in insertion order.
+    """
+    print("\n=== Testing Neighbor Order ===")
+    bfs = BFS()
+    
+    # Complete graph on 300 nodes: ~45000 edges, each added twice
+    nodes = [bfs.add_node(i) for i in range(300)]
+    for a in nodes:
+        for b in nodes:
+            if a is not b:
+                bfs.add_edge(a, b)
+    
+    if [node.value for node in nodes[5].get_neighbors()] == [i for i in range(300) if i != 5]:
+        print("PASS: Duplicate edges are ignored and neighbors keep insertion order")
+    else:
+        print("FAIL: Neighbors are duplicated or out of order")
+    
+    nodes[5].remove_neighbor(nodes[0])
+    nodes[5].remove_neighbor(nodes[0])
+    nodes[5].add_neighbor(nodes[0])
+    order = [node.value for node in nodes[5].get_neighbors()]
+    if order[0] == 1 and order[-1] == 0 and len(order) == 299:
+        print("PASS: Removing and re-adding a neighbor moves it to the end")
+    else:
+        print("FAIL: Removing and re-adding a neighbor gives the wrong order")
+
+def test_graph_loader():
+    """
+    Test bulk loading graphs from files, arrays and iterables.
+    """
+    print("\n=== Testing Graph Loader ===")
+    edges = [(0, 1), (0, 2), (1, 3), (1, 4), (2, 3), (1, 0), (3, 3)]
+    expected = CSRGraph.from_edges(range(5), edges)
+    
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+        file.write("# src,dst\n0,1\n0,2\n1,3\n\n1,4\n2,3\n1,0\n3,3\n")
+        path = file.name
+    # Header lines and comments after an edge, in CSV and whitespace-separated
+    # files, and a CSV header over whitespace-separated edges
+    variants = []
+    for text in ("src,dst\n0,1 # first\n0,2\n1,3\n1,4\n2,3\n1,0\n3,3\n",
+                 "# edges\nsrc dst\n0 1 # first\n0\t2\n1 3\n1 4\n2 3\n\n1 0\n3 3 # loop\n",
+                 "src,dst\n0 1\n0 2\n1 3\n1 4\n2 3\n1 0\n3 3\n",
+                 "0,1\n1,2,3\n"):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as file:
+            file.write(text)
+            variants.append(file.name)
+    original_numpy = graph_loader.numpy
+    try:
+        # Run with and without NumPy (when it is installed)
+        for numpy_module in ([None] if original_numpy is None else [original_numpy, None]):
+            graph_loader.numpy = numpy_module
+            label = "without NumPy" if numpy_module is None else "with NumPy"
+            loader = GraphLoader()
+            graphs = [
+                loader.load_file(path),
+                loader.load_arrays([u for u, _ in edges], [v for _, v in edges]),
+                loader.load_edges(iter(edges)),
+            ]
+            if all(g.offsets == expected.offsets and g.targets == expected.targets for g in graphs):
+                print("PASS: File, array and iterable loads match add_edge order", label)
+            else:
+                print("FAIL: Bulk loads do not match add_edge order", label)
+            
+            if loader.edges_read == 7 and loader.adjacency_entries == 11 and "7 edges" in loader.report():
+                print("PASS: Loader reports edges read and deduplicated adjacency", label)
+            else:
+                print("FAIL: Loader statistics are wrong", label, loader.report())
+            
+            graphs = [loader.load_file(variant) for variant in variants[:3]]
+            if all(g.offsets == expected.offsets and g.targets == expected.targets for g in graphs):
+                print("PASS: Header lines and trailing comments are skipped", label)
+            else:
+                print("FAIL: Header lines or trailing comments are misread", label)
+            
+            try:
+                loader.load_file(variants[3])
+                print("FAIL: Loader accepted a line with three ids", label)
+            except ValueError:
+                print("PASS: Loader rejects a line with three ids", label)
+    finally:
+        graph_loader.numpy = original_numpy
+        os.remove(path)
+        for variant in variants:
+            os.remove(variant)
+    
+    graph = GraphLoader("q").load_edges([(0, 1), (1, 2)], values=["a", "b", "c"])
+    if BFS(graph).bfs_traversal(2) == ["c", "b", "a"]:
+        print("PASS: Loaded graph carries the given node values")
+    else:
+        print("FAIL: Loaded graph does not carry the given node values")
+
+def test_mapped_graph():
+    """
+    Test BFS directly on a memory-mapped graph file.
+    """
+    print("\n=== Testing Mapped Graph ===")
+    edges = [(0, 1), (0, 2), (1, 3), (1, 4), (2, 3)]
+    directory = tempfile.mkdtemp()
+    try:
+        for kind, values in (("id", range(5)), ("int", [1, 2, 3, 4, 5]), ("str", ["a", "b", "c", "d", "é"]),
+                             ("bytes", [b"a", b"b", b"c", b"d", b"e"])):
+            for index_type in ("i", "q"):
+                path = os.path.join(directory, "graph.bin")
+                MappedGraph.write(CSRGraph.from_edges(values, edges, index_type), path)
+                with MappedGraph(path) as graph:
+                    bfs = BFS(graph)
+                    result = (bfs.bfs_traversal(0), bfs.find_path(2, 4), bfs.find_level(0, values[4]))
+                    expected = (list(values), [values[2], values[0], values[1], values[4]], 2)
+                if result == expected:
+                    print("PASS: Mapped graph with", kind, "values and", index_type, "ids traverses correctly")
+                else:
+                    print("FAIL: Mapped graph traverses incorrectly, got", result)
+        
+        with MappedGraph(path) as graph:
+            try:
+                graph.add_edge(0, 4)
+                print("FAIL: Mapped graph accepted a new edge")
+            except TypeError:
+                print("PASS: Mapped graph is read-only")
+        
+        try:
+            MappedGraph.write(CSRGraph.from_edges([1, "b", (3,)], [(0, 1)]), path)
+            print("FAIL: Mapped graph file accepted values of mixed types")
+        except ValueError:
+            print("PASS: Mapped graph file rejects values of mixed types")
+        
+        # A rejected edge leaves the components alone: 0 -- 1 and 2 -- 3
+        MappedGraph.write(CSRGraph.from_edges(range(4), [(0, 1), (2, 3)]), path)
+        with MappedGraph(path) as graph:
+            bfs = BFS(graph)
+            try:
+                bfs.add_edge(0, 2)
+                print("FAIL: BFS added an edge to a mapped graph")
+            except TypeError:
+                if bfs.count_connected_components() == 2 and not bfs.same_component(0, 2):
+                    print("PASS: Rejected edge does not merge components")
+                else:
+                    print("FAIL: Rejected edge merged components")
+        
+        # A rejected value change leaves the value index alone
+        MappedGraph.write(CSRGraph.from_edges([10, 11, 12, 13], [(0, 1)]), path)
+        with MappedGraph(path) as graph:
+            bfs = BFS(graph, index_values=True)
+            try:
+                bfs.set_value(2, 99)
+                print("FAIL: BFS changed a value in a mapped graph")
+            except TypeError:
+                if bfs.has_value(12) and not bfs.has_value(99) and graph.get_value(2) == 12:
+                    print("PASS: Rejected value change keeps the value index")
+                else:
+                    print("FAIL: Rejected value change left the value index stale")
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+def test_directed_graph():
+    """
+    Test BFS on directed graphs, with object nodes and the CSR backend.
+    """
+    print("\n=== Testing Directed Graph ===")
+    # 1 -> 2 -> 4 -> 5
+    # |         ^
+    # v         |
+    # 3 --------+
+    # 6 -> 1
+    edges = [(1, 2), (2, 4), (4, 5), (1, 3), (3, 4), (6, 1)]
+    for name, bfs in (("Object", BFS(directed=True)), ("CSR", BFS(CSRGraph(directed=True)))):
+        nodes = {value: bfs.add_node(value) for value in range(1, 7)}
+        for a, b in edges:
+            bfs.add_edge(nodes[a], nodes[b])
+        
+        if bfs.bfs_traversal(nodes[1]) == [1, 2, 3, 4, 5] and bfs.bfs_traversal(nodes[5]) == [5]:
+            print("PASS: {} traversal follows outgoing edges only".format(name))
+        else:
+            print("FAIL: {} traversal ignores edge directions".format(name))
+        
+        if bfs.find_path(nodes[5], nodes[1]) == [] and bfs.find_path_bidirectional(nodes[5], nodes[1]) == []:
+            print("PASS: {} graph has no path against the edges".format(name))
+        else:
+            print("FAIL: {} graph has a path against the edges".format(name))
+        
+        path = bfs.find_path_bidirectional(nodes[6], nodes[5])
+        if path in ([6, 1, 2, 4, 5], [6, 1, 3, 4, 5]):
+            print("PASS: {} bidirectional search walks incoming edges backwards".format(name))
+        else:
+            print("FAIL: {} bidirectional search returned {}".format(name, path))
+        
+        top_down = bfs.bfs_levels(nodes[6], "top_down")[0]
+        bottom_up = bfs.bfs_levels(nodes[6], "bottom_up")[0]
+        if list(top_down) == [1, 2, 2, 3, 4, 0] and bottom_up == top_down:
+            print("PASS: {} bottom-up levels use incoming edges".format(name))
+        else:
+            print("FAIL: {} levels are {} top-down, {} bottom-up".format(name, list(top_down), list(bottom_up)))
+    
+    graph = CSRGraph.from_edges(range(3), [(0, 1), (0, 2), (1, 2)], directed=True)
+    if list(graph.neighbors(0)) == [1, 2] and list(graph.predecessors(2)) == [0, 1] and \
+            list(graph.predecessors(0)) == [] and len(graph.targets) == 3:
+        print("PASS: Directed CSR graph stores each edge once per direction array")
+    else:
+        print("FAIL: Directed CSR graph adjacency is wrong")
+
+def test_component_tracking():
+    """
+    Test the incremental connected components and same_component queries.
+    """
+    print("\n=== Testing Component Tracking ===")
+    for name, graph in (("Object", BFS()), ("CSR", BFS(CSRGraph()))):
+        nodes = [graph.add_node(i) for i in range(1000)]
+        if graph.count_connected_components() == 1000:
+            print("PASS: {} graph starts with one component per node".format(name))
+        else:
+            print("FAIL: {} graph does not start with one component per node".format(name))
+        
+        # Join even and odd nodes into two chains, one edge at a time
+        for i in range(2, 1000):
+            graph.add_edge(nodes[i - 2], nodes[i])
+        if graph.count_connected_components() == 2 and graph.same_component(nodes[0], nodes[998]) and \
+                not graph.same_component(nodes[0], nodes[999]):
+            print("PASS: {} graph tracks two chains".format(name))
+        else:
+            print("FAIL: {} graph does not track two chains, got".format(name), graph.count_connected_components())
+        
+        graph.add_edge(nodes[999], nodes[0])
+        graph.add_edge(nodes[1], nodes[2])  # Already connected
+        if graph.count_connected_components() == 1 and graph.same_component(nodes[1], nodes[998]):
+            print("PASS: {} graph merges the chains".format(name))
+        else:
+            print("FAIL: {} graph does not merge the chains".format(name))
+    
+    # Directed edges connect their endpoints in both directions (weak components)
+    graph = BFS(directed=True)
+    node1 = graph.add_node(1)
+    node2 = graph.add_node(2)
+    node3 = graph.add_node(3)
+    graph.add_edge(node2, node1)
+    if graph.count_connected_components() == 2 and graph.same_component(node1, node2):
+        print("PASS: Directed graph has weakly connected components")
+    else:
+        print("FAIL: Directed graph components are wrong")
+    
+    # A CSR graph loaded before the search object is created is scanned on
+    # first use, and edges added before then are not lost
+    graph = BFS(CSRGraph.from_edges(range(6), [(0, 1), (2, 3), (3, 4)]))
+    scanned = len(graph.components) > 0
+    graph.add_edge(1, graph.add_node(6))
+    if not scanned and graph.count_connected_components() == 3 and graph.same_component(2, 4) and \
+            graph.same_component(0, 6):
+        print("PASS: Components of a prebuilt CSR graph are found on first use")
+    else:
+        print("FAIL: Components of a prebuilt CSR graph are wrong")
+    
+    # An edge to a node added to the backend directly rescans the components
+    # and still invalidates the cache
+    backend = CSRGraph()
+    graph = BFS(backend, cache_size=2)
+    a = graph.add_node(0)
+    graph.count_connected_components()
+    before = graph.find_path(a, 1)
+    x = backend.add_node(1)
+    graph.add_edge(a, x)
+    if before == [] and graph.find_path(a, x) == [0, 1] and graph.count_connected_components() == 1:
+        print("PASS: Edge to a node added to the backend directly updates the components")
+    else:
+        print("FAIL: Edge to a node added to the backend directly left stale state")
+    
+    # Edges changed on the nodes themselves: x -- y, then y -- z directly
+    graph = BFS()
+    x, y, z = graph.add_node("x"), graph.add_node("y"), graph.add_node("z")
+    graph.add_edge(x, y)
+    y.add_neighbor(z)
+    z.add_neighbor(y)
+    joined = graph.count_connected_components() == 1
+    x.remove_neighbor(y)
+    y.remove_neighbor(x)
+    if joined and not graph.same_component(x, y) and graph.same_component(y, z) and \
+            graph.count_connected_components() == 2:
+        print("PASS: Node.add_neighbor and Node.remove_neighbor update the components")
+    else:
+        print("FAIL: Components are stale after changing node edges")
+
+def test_component_labels():
+    """
+    Test the serial, vectorized and parallel component labeling.
+    """
+    print("\n=== Testing Component Labels ===")
+    bfs = BFS(directed=True)
+    
+    # Directed ring pieces of 3000 nodes: i -> i + 1 except every 100th node
+    nodes = [bfs.add_node(i) for i in range(3000)]
+    for i in range(2999):
+        if (i + 1) % 100 != 0:
+            bfs.add_edge(nodes[i + 1], nodes[i])
+    bfs.add_edge(nodes[2999], nodes[150])  # Joins the last piece to the second
+    
+    expected = [100 if i // 100 == 29 else i // 100 * 100 for i in range(3000)]
+    labels = bfs.component_labels()
+    if list(labels) == expected:
+        print("PASS: Serial labels are the smallest node id of each weak component")
+    else:
+        print("FAIL: Serial labels are wrong")
+    
+    methods = ["parallel"] if component_labels.numpy is None else ["vectorized", "parallel"]
+    for method in methods:
+        result = bfs.component_labels(method, processes=2)
+        if result == labels:
+            print("PASS: {} labels match the serial labels".format(method.capitalize()))
+        else:
+            print("FAIL: {} labels do not match the serial labels".format(method.capitalize()))
+    
+    original_numpy = component_labels.numpy
+    component_labels.numpy = None
+    try:
+        bfs.component_labels("vectorized")
+        print("FAIL: Vectorized labeling without NumPy did not raise")
+    except ValueError:
+        print("PASS: Vectorized labeling without NumPy raises ValueError")
+    finally:
+        component_labels.numpy = original_numpy
+    
+    if list(BFS().component_labels("parallel", processes=1)) == []:
+        print("PASS: Empty graph has no labels")
+    else:
+        print("FAIL: Empty graph has labels")
+
+def test_two_coloring():
+    """
+    Test the two-coloring of every component and the odd-cycle witness.
+    """
+    print("\n=== Testing Two Coloring ===")
+    for name, bfs in (("Object", BFS()), ("CSR", BFS(CSRGraph())), ("Directed", BFS(directed=True))):
+        # Component 1: path 0 -- 1 -- 2 -- 3; component 2: cycle 4 -- 5 -- ... -- 8 -- 4
+        nodes = [bfs.add_node(i) for i in range(9)]
+        edges = [(0, 1), (1, 2), (2, 3), (4, 5), (5, 6), (6, 7), (7, 8), (8, 4)]
+        for a, b in edges[:-1]:
+            bfs.add_edge(nodes[a], nodes[b])
+        
+        colors, cycle = bfs.two_coloring()
+        if cycle is None and all(colors[a] != colors[b] for a, b in edges[:-1]) and \
+                bfs.is_bipartite(nodes[0]):
+            print("PASS: {} two forests get a valid partition".format(name))
+        else:
+            print("FAIL: {} two forests are not partitioned".format(name))
+        
+        # Closing the cycle of 5 makes the component that does not hold nodes[0] odd
+        bfs.add_edge(nodes[8], nodes[4])
+        colors, cycle = bfs.two_coloring()
+        if colors is None and sorted(cycle) == [4, 5, 6, 7, 8] and not bfs.is_bipartite(nodes[0]):
+            print("PASS: {} odd cycle in another component is found:".format(name), cycle)
+        else:
+            print("FAIL: {} odd cycle not found, got".format(name), cycle)
+    
+    # The witness follows edges, and its length is odd
+    bfs = BFS()
+    nodes = [bfs.add_node(i) for i in range(12)]
+    for i in range(11):
+        bfs.add_edge(nodes[i], nodes[(i + 1)])
+    bfs.add_edge(nodes[11], nodes[3])
+    cycle = bfs.two_coloring()[1]
+    closed = cycle + cycle[:1]
+    if sorted(cycle) == list(range(3, 12)) and \
+            all(nodes[b] in nodes[a].neighbors for a, b in zip(closed, closed[1:])):
+        print("PASS: Witness is the odd cycle of 9 behind a tail")
+    else:
+        print("FAIL: Witness is wrong:", cycle)
+
+def test_weighted_paths():
+    """
+    Test the weighted shortest paths with Dijkstra, 0-1 BFS and Dial's buckets.
+    """
+    print("\n=== Testing Weighted Paths ===")
+    # 1 --1-- 2 --1-- 5
+    # |               |
+    # 0               0
+    # |               |
+    # 3 --1-- 4 --0-- 6
+    edges = [(1, 2, 1), (2, 5, 1), (1, 3, 0), (3, 4, 1), (4, 6, 0), (6, 5, 0)]
+    for name, bfs in (("Object", BFS()), ("CSR", BFS(CSRGraph()))):
+        nodes = {value: bfs.add_node(value) for value in range(1, 8)}
+        for a, b, weight in edges:
+            bfs.add_edge(nodes[a], nodes[b], weight)
+        
+        for method in ("dijkstra", "zero_one", "dial"):
+            path = bfs.find_weighted_path(nodes[1], nodes[5], method)
+            distances = bfs.weighted_distances(nodes[1], method)[0]
+            if path == [1, 3, 4, 6, 5] and list(distances) == [0, 1, 0, 1, 1, 1, float("inf")]:
+                print("PASS: {} {} path takes the lighter route:".format(name, method), path)
+            else:
+                print("FAIL: {} {} path is wrong:".format(name, method), path, list(distances))
+        
+        if bfs.find_weighted_path(nodes[1], nodes[7]) == [] and bfs.find_weighted_path(nodes[2], nodes[2]) == [2]:
+            print("PASS: {} unreachable and trivial weighted paths".format(name))
+        else:
+            print("FAIL: {} unreachable or trivial weighted path is wrong".format(name))
+        
+        # Weight 3 is fine for Dijkstra and Dial, not for 0-1 BFS
+        bfs.add_edge(nodes[5], nodes[7], 3)
+        try:
+            bfs.find_weighted_path(nodes[1], nodes[7], "zero_one")
+            print("FAIL: {} 0-1 BFS accepted a weight of 3".format(name))
+        except ValueError:
+            print("PASS: {} 0-1 BFS rejects a weight of 3".format(name))
+        if bfs.find_weighted_path(nodes[1], nodes[7], "dial") == bfs.find_weighted_path(nodes[1], nodes[7]) == \
+                [1, 3, 4, 6, 5, 7]:
+            print("PASS: {} Dial's buckets match Dijkstra".format(name))
+        else:
+            print("FAIL: {} Dial's buckets do not match Dijkstra".format(name))
+    
+    bfs = BFS()
+    node1 = bfs.add_node(1)
+    node2 = bfs.add_node(2)
+    bfs.add_edge(node1, node2, 0.5)
+    try:
+        bfs.find_weighted_path(node1, node2, "dial")
+        print("FAIL: Dial's algorithm accepted a fractional weight")
+    except ValueError:
+        print("PASS: Dial's algorithm rejects a fractional weight")
+    if bfs.weighted_distances(node1)[0][1] == 0.5 and node1.get_weight(node2) == 0.5 and \
+            CSRGraph.from_nodes(bfs.get_nodes()).weights.tolist() == [0.5, 0.5]:
+        print("PASS: Fractional weights are kept by Dijkstra and CSR conversion")
+    else:
+        print("FAIL: Fractional weights are lost")
+    
+    # A converted weighted graph keeps accepting edges, weighted or not
+    converted = CSRGraph.from_nodes(bfs.get_nodes())
+    node3 = converted.add_node(3)
+    converted.add_edge(1, node3)
+    converted.add_edge(0, node3, 2)
+    path = BFS(converted).find_weighted_path(0, node3)
+    if converted.weights.tolist() == [0.5, 2.0, 0.5, 1.0, 1.0, 2.0] and path == [1, 2, 3]:
+        print("PASS: Edges added after CSR conversion keep their weights")
+    else:
+        print("FAIL: Converted graph has weights {} and path {}".format(converted.weights, path))
+
+def build_grid(bfs, size, walls=()):
+    """
+    Build a size x size grid of 4-neighbor moves; node values and coordinates
+    are (row, column) pairs, and cells in walls are left out.
+    
+    Returns:
+        Dictionary from (row, column) to node
+    """
+    cells = {}
+    for row in range(size):
+        for column in range(size):
+            if (row, column) not in walls:
+                cells[row, column] = bfs.add_node((row, column), (row, column))
+    for (row, column), node in cells.items():
+        for neighbor in ((row + 1, column), (row, column + 1)):
+            if neighbor in cells:
+                bfs.add_edge(node, cells[neighbor])
+    return cells
+
+def test_astar():
+    """
+    Test A* search with different heuristics.
+    """
+    print("\n=== Testing A* Search ===")
+    # 30 x 30 grid with a wall across column 15, open only at row 29
+    bfs = BFS()
+    cells = build_grid(bfs, 30, {(row, 15) for row in range(29)})
+    start, end = cells[0, 0], cells[0, 29]
+    
+    shortest = bfs.find_path(start, end)
+    path, expanded = bfs.find_path_astar(start, end, heuristics.manhattan)
+    _, uniform = bfs.find_path_astar(start, end, heuristics.zero)
+    steps_valid = all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+    if len(path) == len(shortest) == 88 and path[0] == (0, 0) and path[-1] == (0, 29) and steps_valid:
+        print("PASS: A* finds a shortest path around the wall")
+    else:
+        print("FAIL: A* path is wrong:", len(path), len(shortest))
+    
+    if expanded < uniform:
+        print("PASS: Manhattan heuristic expands {} nodes, zero heuristic {}".format(expanded, uniform))
+    else:
+        print("FAIL: Manhattan heuristic expands {} nodes, zero heuristic {}".format(expanded, uniform))
+    
+    # Open grid: the heuristic is exact, so only the nodes on one path are expanded
+    bfs = BFS(CSRGraph())
+    cells = build_grid(bfs, 30)
+    path, expanded = bfs.find_path_astar(cells[0, 0], cells[29, 29], heuristics.manhattan)
+    if len(path) == 59 and expanded == 59:
+        print("PASS: CSR A* with an exact heuristic expands only the path")
+    else:
+        print("FAIL: CSR A* expanded {} nodes for a path of {}".format(expanded, len(path)))
+    
+    # Weighted edges with the default Euclidean heuristic
+    bfs = BFS()
+    a = bfs.add_node("a", (0, 0))
+    b = bfs.add_node("b", (1, 1))
+    c = bfs.add_node("c", (2, 0))
+    d = bfs.add_node("d")
+    bfs.set_coordinates(d, (5, 5))
+    bfs.add_edge(a, c, 5)
+    bfs.add_edge(a, b, 1.5)
+    bfs.add_edge(b, c, 1.5)
+    if bfs.find_path_astar(a, c)[0] == ["a", "b", "c"] and bfs.find_path_astar(a, d) == ([], 3):
+        print("PASS: Euclidean A* follows the lighter route and reports unreachable nodes")
+    else:
+        print("FAIL: Euclidean A* is wrong:", bfs.find_path_astar(a, c), bfs.find_path_astar(a, d))
+    
+    # Nodes without coordinates are estimated at 0. v is first reached by the
+    # heavy edge s -- v; the lighter route through u, which is placed far from
+    # t, is found later and v is expanded again
+    bfs = BFS()
+    s = bfs.add_node("s", (5, 0))
+    u = bfs.add_node("u", (0, 0))
+    v = bfs.add_node("v")
+    t = bfs.add_node("t", (10, 0))
+    bfs.add_edge(s, v, 3)
+    bfs.add_edge(s, u, 0.5)
+    bfs.add_edge(u, v, 0.5)
+    bfs.add_edge(v, t, 9.5)
+    path, expanded = bfs.find_path_astar(s, t)
+    if path == ["s", "u", "v", "t"] and expanded == 5:
+        print("PASS: A* searches through nodes without coordinates")
+    else:
+        print("FAIL: A* through nodes without coordinates gives", path, expanded)
+    try:
+        bfs.find_path_astar(s, v)
+        print("FAIL: A* accepted a target without coordinates")
+    except ValueError:
+        print("PASS: A* rejects a target without coordinates")
+    
+    bfs = BFS(CSRGraph.from_edges(range(3), [(0, 1), (1, 2)]))
+    bfs.add_node(3)
+    unallocated = bfs.coordinates is None
+    bfs.set_coordinates(2, (2, 0))
+    bfs.set_coordinates(0, (0, 0))
+    if unallocated and bfs.find_path_astar(0, 2)[0] == [0, 1, 2] and len(bfs.coordinates) == 4:
+        print("PASS: Coordinates are allocated on first use")
+    else:
+        print("FAIL: Coordinates are not allocated on first use")
+
+def test_query_cache():
+    """
+    Test the LRU cache of find_path and find_level results.
+    """
+    print("\n=== Testing Query Cache ===")
+    bfs = BFS(cache_size=2)
+    
+    # 1 -- 2 -- 3 -- 4
+    nodes = [bfs.add_node(i) for i in range(1, 5)]
+    for i in range(3):
+        bfs.add_edge(nodes[i], nodes[i + 1])
+    
+    first = bfs.find_path(nodes[0], nodes[3])
+    first.append("changed")  # Callers get their own copy
+    second = bfs.find_path(nodes[0], nodes[3])
+    level = bfs.find_level(nodes[0], 4)
+    bfs.find_level(nodes[0], 4)
+    if second == [1, 2, 3, 4] and level == 3 and bfs.cache.hits == 2 and bfs.cache.misses == 2:
+        print("PASS: Repeated queries are answered from the cache")
+    else:
+        print("FAIL: Cache counted {} hits and {} misses".format(bfs.cache.hits, bfs.cache.misses))
+    
+    # A third query evicts the least recently used one
+    bfs.find_path(nodes[1], nodes[2])
+    bfs.find_level(nodes[0], 4)
+    bfs.find_path(nodes[0], nodes[3])
+    if len(bfs.cache) == 2 and bfs.cache.hits == 3 and bfs.cache.misses == 4:
+        print("PASS: Least recently used result is evicted")
+    else:
+        print("FAIL: Eviction is wrong: {} entries, {} hits, {} misses".format(
+            len(bfs.cache), bfs.cache.hits, bfs.cache.misses))
+    
+    # Every kind of change invalidates the cache
+    changes = [
+        ("add_edge", lambda: bfs.add_edge(nodes[0], nodes[3]), [1, 4], 1),
+        ("Node.remove_neighbor", lambda: (nodes[0].remove_neighbor(nodes[3]), nodes[3].remove_neighbor(nodes[0])), [1, 2, 3, 4], 3),
+        ("Node.set_value", lambda: nodes[3].set_value(40), [1, 2, 3, 40], -1),
+        ("add_edge to a new node", lambda: bfs.add_edge(nodes[0], bfs.add_node(4)), [1, 2, 3, 40], 1),
+    ]
+    for name, change, path, level in changes:
+        bfs.find_path(nodes[0], nodes[3])
+        bfs.find_level(nodes[0], 4)
+        change()
+        if bfs.find_path(nodes[0], nodes[3]) == path and bfs.find_level(nodes[0], 4) == level:
+            print("PASS: {} invalidates cached results".format(name))
+        else:
+            print("FAIL: {} leaves stale results".format(name))
+    
+    version = bfs.cache.version
+    bfs.add_node(5)
+    if bfs.cache.version == version + 1 and len(bfs.cache) == 0:
+        print("PASS: add_node invalidates cached results")
+    else:
+        print("FAIL: add_node leaves cached results")
+    
+    bfs.clear()
+    if len(bfs.cache) == 0 and nodes[0].graph is None:
+        print("PASS: clear invalidates the cache and detaches the nodes")
+    else:
+        print("FAIL: clear leaves cached results")
+    
+    bfs = BFS(CSRGraph(), cache_size=16)
+    nodes = [bfs.add_node(i) for i in range(3)]
+    bfs.add_edge(nodes[0], nodes[1])
+    before = bfs.find_path(nodes[0], nodes[2])
+    bfs.add_edge(nodes[1], nodes[2])
+    if before == [] and bfs.find_path(nodes[0], nodes[2]) == [0, 1, 2] and bfs.cache.hit_rate() == 0.0:
+        print("PASS: CSR graph changes invalidate the cache")
+    else:
+        print("FAIL: CSR graph changes leave stale results")
+
+def test_landmark_oracle():
+    """
+    Test distance queries answered from landmark bounds.
+    """
+    print("\n=== Testing Landmark Oracle ===")
+    for backend in ("Node", "CSR"):
+        bfs = BFS(CSRGraph()) if backend == "CSR" else BFS()
+        cells = build_grid(bfs, 6, {(row, 3) for row in range(5)})
+        island = [bfs.add_node("island"), bfs.add_node("island")]
+        bfs.add_edge(island[0], island[1])
+        oracle = bfs.landmark_oracle(3)
+        nodes = bfs.get_nodes()
+        
+        wrong = []
+        for u in range(len(nodes)):
+            levels = bfs.bfs_levels(nodes[u])[0]
+            for v in range(len(nodes)):
+                lower, upper = oracle.bounds(nodes[u], nodes[v])
+                if levels[v] == -1:
+                    if upper not in (-1, None):
+                        wrong.append((u, v))
+                elif not lower <= levels[v] <= upper or oracle.distance(nodes[u], nodes[v]) != levels[v]:
+                    wrong.append((u, v))
+        if not wrong:
+            print("PASS: {} bounds hold and distances are exact".format(backend))
+        else:
+            print("FAIL: {} oracle is wrong for {} pairs, e.g. {}".format(backend, len(wrong), wrong[0]))
+        
+        # The first landmark is node 0; the second is on the island
+        landmark = nodes[oracle.landmarks[0]]
+        if oracle.bounds(landmark, cells[5, 5]) == (10, 10) and oracle.bounds(cells[0, 0], island[0]) == (-1, -1):
+            print("PASS: {} landmark queries are tight and components are separated".format(backend))
+        else:
+            print("FAIL: {} bounds are {} and {}".format(
+                backend, oracle.bounds(landmark, cells[5, 5]), oracle.bounds(cells[0, 0], island[0])))
+        
+        start = cells[0, 2]
+        if (oracle.find_level(start, (0, 4)) == bfs.find_level(start, (0, 4)) == 12
+                and oracle.find_level(start, "island") == -1):
+            print("PASS: {} find_level matches BFS.find_level".format(backend))
+        else:
+            print("FAIL: {} find_level gives {}".format(backend, oracle.find_level(start, (0, 4))))
+    
+    # With slack the oracle answers from the bounds instead of searching:
+    # the one landmark, (0, 0), bounds the distance between 8 and 18
+    bfs = BFS()
+    cells = build_grid(bfs, 10)
+    oracle = bfs.landmark_oracle(1)
+    estimate = oracle.distance(cells[2, 3], cells[7, 6], tolerance=10)
+    exact = oracle.distance(cells[2, 3], cells[7, 6], tolerance=9)
+    if estimate == oracle.estimate(cells[2, 3], cells[7, 6]) == 18 and exact == 8 and oracle.tight == 1 and oracle.fallbacks == 1:
+        print("PASS: Tolerance trades exactness for skipping the search")
+    else:
+        print("FAIL: Got {} (estimate) and {} (exact)".format(estimate, exact))
+    
+    for strategy in ("degree", "random"):
+        oracle = bfs.landmark_oracle(4, strategy, seed=1)
+        if len(set(oracle.landmarks)) == 4 and oracle.distance(cells[0, 0], cells[9, 9]) == 18:
+            print("PASS: {} landmarks give exact distances".format(strategy))
+        else:
+            print("FAIL: {} landmarks are {}".format(strategy, oracle.landmarks))
+    
+    for args, kwargs in (((BFS(directed=True),), {}), ((bfs,), {"strategy": "central"})):
+        try:
+            LandmarkOracle(*args, **kwargs)
+            print("FAIL: LandmarkOracle accepted {}".format(kwargs or "a directed graph"))
+        except ValueError:
+            print("PASS: LandmarkOracle rejects {}".format(kwargs or "a directed graph"))
+
 def main():
     """
     Main method to run the tests.
@@ -289,6 +1419,28 @@ def main():
     test_find_level()
     test_connected_components()
     test_bipartite()
+    test_csr_backend()
+    test_visited_tracking()
+    test_direction_optimizing()
+    test_find_path_bidirectional()
+    test_multi_source_bfs()
+    test_batched_bfs()
+    test_parallel_bfs()
+    test_iter_bfs()
+    test_find_level_early_exit()
+    test_value_index()
+    test_slotted_nodes()
+    test_neighbor_order()
+    test_graph_loader()
+    test_mapped_graph()
+    test_directed_graph()
+    test_component_tracking()
+    test_component_labels()
+    test_two_coloring()
+    test_weighted_paths()
+    test_astar()
+    test_query_cache()
+    test_landmark_oracle()
     
     print("All tests completed.")
 
@@ -0,0 +1,342 @@
+"""
+Compressed sparse row (CSR) graph for BFS implementation.
+This class stores the graph as flat integer arrays instead of Node objects.
+"""
+from array import array
+from itertools import repeat
+
+class CSRGraph:
+    def __init__(self, index_type="i", directed=False):
+        """
+        Constructor to create a new, empty CSR graph.
+
+        Nodes are identified by integer ids (0, 1, 2, ...) in insertion order.
+        The neighbors of node u are targets[offsets[u]:offsets[u + 1]].
+
+        Args:
+            index_type: Array typecode for offsets and targets,
+                "i" (int32) or "q" (int64) for graphs with more than 2^31 edges
+            directed: Store each edge once, as u -> v, instead of in both
+                directions. The incoming edges are then kept in a second pair of
+                arrays, in_offsets and in_targets.
+        """
+        if index_type not in ("i", "q"):
+            raise ValueError("index_type must be 'i' (int32) or 'q' (int64)")
+        self.index_type = index_type
+        self.directed = directed
+        self.values = []  # Value of each node, indexed by node id
+        self.offsets = array(index_type, [0])  # Start of each node's row in targets
+        self.targets = array(index_type)  # Concatenated neighbor ids
+        self.in_offsets = array(index_type, [0])  # Same as offsets and targets for incoming
+        self.in_targets = array(index_type)  # edges, when directed
+        self.weights = None  # Edge weights parallel to targets, once a weight other than 1 is added
+        self._pending_src = array(index_type)  # Edges added since the last compact()
+        self._pending_dst = array(index_type)
+        self._pending_weights = None
+        self._dirty = False
+
+    @classmethod
+    def from_edges(cls, values, edges, index_type="i", directed=False):
+        """
+        Bulk-load a graph from node values and an iterable of edges.
+
+        Args:
+            values: Iterable of node values; node ids follow its order
+            edges: Iterable of (u, v) node id pairs
+            index_type: Array typecode for offsets and targets
+            directed: Add the edges as u -> v instead of undirected edges
+
+        Returns:
+            The newly created graph
+        """
+        graph = cls(index_type, directed)
+        graph.values.extend(values)
+        for u, v in edges:
+            graph._pending_src.append(u)
+            graph._pending_dst.append(v)
+            if not directed:
+                graph._pending_src.append(v)
+                graph._pending_dst.append(u)
+        graph._dirty = True
+        graph.compact()
+        return graph
+
+    @classmethod
+    def from_nodes(cls, nodes, index_type="i", directed=False):
+        """
+        Convert a list of Node objects into a CSR graph.
+
+        Args:
+            nodes: List of nodes; node ids follow its order
+            index_type: Array typecode for offsets and targets
+            directed: Whether the nodes' neighbors are outgoing edges of a
+                directed graph rather than both directions of undirected edges
+
+        Returns:
+            The newly created graph, with neighbor order and edge weights
+            preserved; in a directed graph the incoming rows follow each node's
+            in_neighbors when they list every edge
+        """
+        graph = cls(index_type, directed)
+        ids = {}
+        for node in nodes:
+            ids[node] = len(graph.values)
+            graph.values.append(node.value)
+        weights = array("d")
+        for node in nodes:
+            graph.targets.extend(ids[neighbor] for neighbor in node.neighbors)
+            graph.offsets.append(len(graph.targets))
+            weights.extend(node.neighbors.values())
+        if any(weight != 1 for weight in weights):
+            graph.weights = weights
+            graph._pending_weights = array("d")
+        if directed:
+            for node in nodes:
+                graph.in_targets.extend(ids[neighbor] for neighbor in node.in_neighbors or ())
+                graph.in_offsets.append(len(graph.in_targets))
+            if len(graph.in_targets) != len(graph.targets):
+                graph._transpose()  # Incoming edges were not recorded
+        return graph
+
+    def add_node(self, value):
+        """
+        Add a new node to the graph.
+
+        Args:
+            value: The value to be stored in the new node
+
+        Returns:
+            The id of the newly created node
+        """
+        self.values.append(value)
+        self._dirty = True
+        return len(self.values) - 1
+
+    def add_edge(self, node1, node2, weight=1):
+        """
+        Add an edge between two nodes in the graph: node1 -> node2 if the
+        graph is directed, an undirected edge otherwise.
+
+        Edges are buffered and merged into the arrays on the next compact().
+        The weights array is only allocated once a weight other than 1 is added.
+
+        Args:
+            node1: Id of the first node
+            node2: Id of the second node
+            weight: Weight of the edge; ignored if the edge is already there
+        """
+        if weight != 1 and self.weights is None:
+            self.weights = array("d", [1.0]) * len(self.targets)
+            self._pending_weights = array("d", [1.0]) * len(self._pending_src)
+        self._pending_src.append(node1)
+        self._pending_dst.append(node2)
+        if not self.directed:
+            self._pending_src.append(node2)
+            self._pending_dst.append(node1)
+        if self._pending_weights is not None:
+            self._pending_weights.append(weight)
+            if not self.directed:
+                self._pending_weights.append(weight)
+        self._dirty = True
+
+    def compact(self):
+        """
+        Merge buffered nodes and edges into the offsets and targets arrays.
+
+        Rows keep insertion order and duplicate edges are dropped, matching
+        Node.add_neighbor.
+        """
+        if not self._dirty:
+            return
+        n = len(self.values)
+        old_offsets, old_targets = self.offsets, self.targets
+        old_n = len(old_offsets) - 1
+
+        # Counting sort of the old rows plus the pending edges by source node
+        bounds = array(self.index_type, [0]) * (n + 1)
+        for u in range(old_n):
+            bounds[u + 1] = old_offsets[u + 1] - old_offsets[u]
+        for u in self._pending_src:
+            bounds[u + 1] += 1
+        for u in range(n):
+            bounds[u + 1] += bounds[u]
+
+        targets = array(self.index_type, [0]) * bounds[n]
+        weights = None if self.weights is None else array("d", [0.0]) * bounds[n]
+        cursor = bounds[:-1]
+        for u in range(old_n):
+            first, end = old_offsets[u], old_offsets[u + 1]
+            targets[cursor[u]:cursor[u] + end - first] = old_targets[first:end]
+            if weights is not None:
+                weights[cursor[u]:cursor[u] + end - first] = self.weights[first:end]
+            cursor[u] += end - first
+        for k, (u, v) in enumerate(zip(self._pending_src, self._pending_dst)):
+            targets[cursor[u]] = v
+            if weights is not None:
+                weights[cursor[u]] = self._pending_weights[k]
+            cursor[u] += 1
+
+        # Drop duplicate neighbors in place, keeping the first occurrence
+        offsets = array(self.index_type, [0]) * (n + 1)
+        seen = array(self.index_type, [-1]) * n
+        write = 0
+        for u in range(n):
+            for k in range(bounds[u], bounds[u + 1]):
+                v = targets[k]
+                if seen[v] != u:
+                    seen[v] = u
+                    targets[write] = v
+                    if weights is not None:
+                        weights[write] = weights[k]
+                    write += 1
+            offsets[u + 1] = write
+        del targets[write:]
+        if weights is not None:
+            del weights[write:]
+
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._pending_src = array(self.index_type)
+        self._pending_dst = array(self.index_type)
+        if weights is not None:
+            self._pending_weights = array("d")
+        self._dirty = False
+        if self.directed:
+            self._transpose()
+
+    def _transpose(self):
+        """
+        Rebuild in_offsets and in_targets from offsets and targets.
+
+        A counting sort by target keeps each incoming row ordered by source id.
+        """
+        n = len(self.offsets) - 1
+        offsets, targets = self.offsets, self.targets
+        in_offsets = array(self.index_type, [0]) * (n + 1)
+        for v in targets:
+            in_offsets[v + 1] += 1
+        for v in range(n):
+            in_offsets[v + 1] += in_offsets[v]
+        in_targets = array(self.index_type, [0]) * len(targets)
+        cursor = in_offsets[:-1]
+        for u in range(n):
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                in_targets[cursor[v]] = u
+                cursor[v] += 1
+        self.in_offsets = in_offsets
+        self.in_targets = in_targets
+
+    def get_value(self, node):
+        """
+        Get the value stored in a node.
+
+        Args:
+            node: Id of the node
+
+        Returns:
+            The value stored in the node
+        """
+        return self.values[node]
+
+    def neighbors(self, node):
+        """
+        Get the neighbors of a node.
+
+        Args:
+            node: Id of the node
+
+        Returns:
+            Array of neighbor ids
+        """
+        if self._dirty:
+            self.compact()
+        offsets = self.offsets
+        return self.targets[offsets[node]:offsets[node + 1]]
+
+    def weighted_neighbors(self, node):
+        """
+        Get the neighbors of a node with the weights of the edges to them.
+
+        Args:
+            node: Id of the node
+
+        Returns:
+            Iterable of (neighbor id, weight) pairs
+        """
+        if self._dirty:
+            self.compact()
+        first, end = self.offsets[node], self.offsets[node + 1]
+        if self.weights is None:
+            return zip(self.targets[first:end], repeat(1))
+        return zip(self.targets[first:end], self.weights[first:end])
+
+    def predecessors(self, node):
+        """
+        Get the nodes with an edge to a node.
+
+        Args:
+            node: Id of the node
+
+        Returns:
+            Array of ids of the nodes u with an edge u -> node; the same as
+            neighbors(node) if the graph is undirected
+        """
+        if not self.directed:
+            return self.neighbors(node)
+        if self._dirty:
+            self.compact()
+        in_offsets = self.in_offsets
+        return self.in_targets[in_offsets[node]:in_offsets[node + 1]]
+
+    def get_nodes(self):
+        """
+        Get all node ids in the graph.
+
+        Returns:
+            Range over all node ids
+        """
+        return range(len(self.values))
+
+    def node_count(self):
+        """
+        Get the number of nodes in the graph.
+
+        Returns:
+            Number of nodes
+        """
+        return len(self.values)
+
+    def memory_usage(self):
+        """
+        Get the number of bytes held by the offsets and targets arrays, plus
+        their incoming-edge counterparts if the graph is directed and the
+        weights if it has any.
+
+        Returns:
+            Size of the adjacency structure in bytes
+        """
+        self.compact()
+        entries = len(self.offsets) + len(self.targets)
+        if self.directed:
+            entries += len(self.in_offsets) + len(self.in_targets)
+        size = entries * self.offsets.itemsize
+        if self.weights is not None:
+            size += len(self.weights) * self.weights.itemsize
+        return size
+
+    def clear(self):
+        """
+        Clear all nodes and edges from the graph.
+        """
+        self.values.clear()
+        self.offsets = array(self.index_type, [0])
+        self.targets = array(self.index_type)
+        self.in_offsets = array(self.index_type, [0])
+        self.in_targets = array(self.index_type)
+        self.weights = None
+        self._pending_src = array(self.index_type)
+        self._pending_dst = array(self.index_type)
+        self._pending_weights = None
+        self._dirty = False
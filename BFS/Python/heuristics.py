@@ -0,0 +1,61 @@
+"""
+Distance heuristics for BFS implementation.
+These functions estimate the remaining path weight for BFS.find_path_astar.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0088  # Mean Earth radius
+
+def zero(a, b):
+    """
+    Estimate nothing, which turns A* into Dijkstra's algorithm.
+
+    Returns:
+        0
+    """
+    return 0
+
+def manhattan(a, b):
+    """
+    Sum of coordinate differences; admissible on grids with 4-neighbor moves
+    of weight 1.
+
+    Args:
+        a: Coordinates of a node
+        b: Coordinates of the target
+
+    Returns:
+        The Manhattan (L1) distance
+    """
+    return sum(abs(x - y) for x, y in zip(a, b))
+
+def euclidean(a, b):
+    """
+    Straight-line distance; admissible when edge weights are at least the
+    distance between their endpoints.
+
+    Args:
+        a: Coordinates of a node
+        b: Coordinates of the target
+
+    Returns:
+        The Euclidean (L2) distance
+    """
+    return math.dist(a, b)
+
+def haversine(a, b):
+    """
+    Great-circle distance for geo graphs whose edge weights are in kilometres.
+
+    Args:
+        a: (latitude, longitude) of a node, in degrees
+        b: (latitude, longitude) of the target, in degrees
+
+    Returns:
+        The distance in kilometres
+    """
+    lat1, lon1 = math.radians(a[0]), math.radians(a[1])
+    lat2, lon2 = math.radians(b[0]), math.radians(b[1])
+    h = math.sin((lat2 - lat1) / 2) ** 2 + \
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
@@ -0,0 +1,146 @@
+"""
+Landmark distance oracle for BFS implementation.
+This class answers distance queries from BFS distances precomputed at a few landmarks.
+"""
+import random
+from array import array
+
+class LandmarkOracle:
+    def __init__(self, bfs, k=16, strategy="farthest", seed=None):
+        """
+        Constructor to choose k landmarks and run one BFS from each.
+
+        For any landmark l reaching u and v, the triangle inequality gives
+        |d(l, u) - d(l, v)| <= d(u, v) <= d(l, u) + d(l, v), so every query
+        costs O(k) array lookups. A landmark that reaches only one of them
+        proves they are not connected. The oracle describes the graph as it
+        was when built; build a new one after changing the graph.
+
+        Args:
+            bfs: BFS instance holding an undirected graph
+            k: Number of landmarks (at most the number of nodes)
+            strategy: "farthest" (each landmark is the node farthest from the
+                ones already chosen, or a node none of them reach), "degree"
+                (the k nodes with the most neighbors) or "random"
+            seed: Random seed for the "random" strategy
+        """
+        if bfs.directed:
+            raise ValueError("landmark bounds need an undirected graph")
+        if strategy not in ("farthest", "degree", "random"):
+            raise ValueError("strategy must be 'farthest', 'degree' or 'random'")
+        self.bfs = bfs
+        nodes = bfs.get_nodes()
+        n = len(nodes)
+        k = min(k, n)
+        self.landmarks = []  # Landmark node ids
+        self.levels = []  # BFS levels from each landmark, indexed by node id
+        self.tight = 0  # Queries answered from the bounds alone
+        self.fallbacks = 0  # Queries that needed a bidirectional search
+
+        if strategy == "degree":
+            neighbors = bfs._neighbors
+            chosen = sorted(range(n), key=lambda i: -len(neighbors(nodes[i])))[:k]
+        elif strategy == "random":
+            chosen = random.Random(seed).sample(range(n), k)
+        else:
+            chosen = None
+            closest = array("i", [-1]) * n  # Distance to the nearest landmark, -1 if none reaches
+        for _ in range(k):
+            if chosen is not None:
+                landmark = chosen[len(self.landmarks)]
+            else:
+                landmark = max(range(n), key=lambda i: n if closest[i] == -1 else closest[i])
+            levels = bfs.bfs_levels(nodes[landmark])[0]
+            self.landmarks.append(landmark)
+            self.levels.append(levels)
+            if chosen is None:
+                for i in range(n):
+                    if levels[i] != -1 and (closest[i] == -1 or levels[i] < closest[i]):
+                        closest[i] = levels[i]
+
+    def bounds(self, start_node, end_node):
+        """
+        Bound the distance between two nodes from the landmark distances.
+
+        Args:
+            start_node: First node
+            end_node: Second node
+
+        Returns:
+            Tuple of (lower, upper) bounds on the distance; (-1, -1) if a
+            landmark proves the nodes are not connected, and upper is None if
+            no landmark reaches them
+        """
+        u = self.bfs._index(start_node)
+        v = self.bfs._index(end_node)
+        if u == v:
+            return 0, 0
+        lower = 0
+        upper = None
+        for levels in self.levels:
+            a = levels[u]
+            b = levels[v]
+            if a == -1 and b == -1:
+                continue
+            if a == -1 or b == -1:
+                return -1, -1
+            lower = max(lower, abs(a - b))
+            if upper is None or a + b < upper:
+                upper = a + b
+        return lower, upper
+
+    def estimate(self, start_node, end_node):
+        """
+        Approximate the distance between two nodes in O(k).
+
+        Returns:
+            The upper bound from the landmarks (exact when a shortest path
+            passes through a landmark), -1 if the nodes are not connected, or
+            None if no landmark reaches them
+        """
+        return self.bounds(start_node, end_node)[1]
+
+    def distance(self, start_node, end_node, tolerance=0):
+        """
+        Get the distance between two nodes, searching only when the bounds are loose.
+
+        Args:
+            start_node: First node
+            end_node: Second node
+            tolerance: Accept the upper bound when it exceeds the lower bound by
+                at most this much; 0 always returns the exact distance
+
+        Returns:
+            Number of edges on a shortest path (within tolerance), or -1 if
+            the nodes are not connected
+        """
+        if start_node is None or end_node is None:
+            return -1
+        lower, upper = self.bounds(start_node, end_node)
+        if upper is not None and upper - lower <= tolerance:
+            self.tight += 1
+            return upper
+        self.fallbacks += 1
+        return len(self.bfs.find_path_bidirectional(start_node, end_node)) - 1
+
+    def find_level(self, start_node, target_value, tolerance=0):
+        """
+        Find the level (distance) of the nearest node holding target_value,
+        like BFS.find_level.
+
+        Args:
+            start_node: Starting node
+            target_value: Value to search for
+            tolerance: Slack allowed on each candidate's distance; see distance
+
+        Returns:
+            Level of the nearest target node, or -1 if none is reachable
+        """
+        if start_node is None:
+            return -1
+        best = -1
+        for node in self.bfs.find_nodes(target_value):
+            level = self.distance(start_node, node, tolerance)
+            if level != -1 and (best == -1 or level < best):
+                best = level
+        return best
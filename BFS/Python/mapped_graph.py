@@ -0,0 +1,197 @@
+"""
+Memory-mapped CSR graph for BFS implementation.
+This class traverses a graph file in place, without deserializing it.
+
+File layout (little-endian, every section starts on an 8-byte boundary):
+    header   magic b"CSRG", format version, index typecode, value kind,
+             node count, target count
+    offsets  (node count + 1) integers of the index typecode
+    targets  target count integers of the index typecode
+    values   absent (values are the node ids), node count int64 values,
+             or (node count + 1) int64 offsets into a table of concatenated
+             UTF-8 strings or bytes values
+"""
+import mmap
+import struct
+import sys
+from array import array
+from csr_graph import CSRGraph
+
+MAGIC = b"CSRG"
+VERSION = 2
+HEADER = struct.Struct("<4sHcBQQ")
+VALUES_IDS = 0  # No value table: each node's value is its id
+VALUES_INT64 = 1  # int64 value table, mapped like the adjacency
+VALUES_STR = 2  # UTF-8 string table, decoded one value at a time
+VALUES_BYTES = 3  # bytes table, copied out one value at a time
+
+def _padding(size):
+    """
+    Number of zero bytes that bring size up to a multiple of 8.
+    """
+    return -size % 8
+
+def _table(values):
+    """
+    Encode a list of bytes values as int64 offsets followed by the values.
+    """
+    offsets = array("q", [0])
+    for value in values:
+        offsets.append(offsets[-1] + len(value))
+    return offsets.tobytes() + b"".join(values)
+
+class _MappedValues:
+    def __init__(self, offsets, data, decode):
+        """
+        Read-only sequence over a table of concatenated values.
+
+        Args:
+            offsets: int64 memoryview; value i is data[offsets[i]:offsets[i + 1]]
+            data: Byte memoryview holding the concatenated values
+            decode: Whether the values are UTF-8 strings rather than bytes
+        """
+        self.offsets = offsets
+        self.data = data
+        self.decode = decode
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, node):
+        if not 0 <= node < len(self.offsets) - 1:
+            raise IndexError("node id out of range")
+        value = self.data[self.offsets[node]:self.offsets[node + 1]]
+        return str(value, "utf-8") if self.decode else bytes(value)
+
+    def release(self):
+        """
+        Release the views into the mapping.
+        """
+        self.offsets.release()
+        self.data.release()
+
+class MappedGraph(CSRGraph):
+    def __init__(self, path):
+        """
+        Constructor to map a graph file written by MappedGraph.write.
+
+        The offsets, targets and values are views into a read-only mapping, so
+        opening is O(1) in the graph size, and processes that map the same file
+        share one page-cache copy. String and bytes values are copied out of the
+        mapping one at a time, when they are read. Call close() (or use it as a
+        context manager) to release the mapping.
+
+        Args:
+            path: Path of the graph file
+        """
+        if sys.byteorder != "little":
+            raise ValueError("graph files can only be mapped on little-endian machines")
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_type, value_kind, nodes, targets = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("not a version {} graph file: {}".format(VERSION, path))
+
+        self.index_type = index_type.decode()
+        itemsize = array(self.index_type).itemsize
+        view = memoryview(self._map)
+        position = HEADER.size + _padding(HEADER.size)
+        size = (nodes + 1) * itemsize
+        self.offsets = view[position:position + size].cast(self.index_type)
+        position += size + _padding(size)
+        size = targets * itemsize
+        self.targets = view[position:position + size].cast(self.index_type)
+        position += size + _padding(size)
+        if value_kind == VALUES_IDS:
+            self.values = range(nodes)
+        elif value_kind == VALUES_INT64:
+            self.values = view[position:position + nodes * 8].cast("q")
+        elif value_kind in (VALUES_STR, VALUES_BYTES):
+            size = (nodes + 1) * 8
+            offsets = view[position:position + size].cast("q")
+            self.values = _MappedValues(offsets, view[position + size:], value_kind == VALUES_STR)
+        else:
+            view.release()
+            self.close()
+            raise ValueError("unknown value kind {} in graph file: {}".format(value_kind, path))
+        view.release()
+        self.directed = False
+        self.weights = None
+        self._pending_src = None
+        self._pending_dst = None
+        self._pending_weights = None
+        self._dirty = False
+
+    @staticmethod
+    def write(graph, path):
+        """
+        Write a CSR graph to a file that MappedGraph can map.
+
+        Node values must all be ints that fit in int64, all strings or all
+        bytes; other values cannot be mapped and raise ValueError.
+
+        Args:
+            graph: CSRGraph (or MappedGraph) to write
+            path: Path of the file to create
+        """
+        if graph.directed or graph.weights is not None:
+            raise ValueError("graph files hold undirected, unweighted graphs only")
+        graph.compact()
+        nodes = len(graph.values)
+        values = graph.values
+        if isinstance(values, range) and values == range(nodes):
+            value_kind, table = VALUES_IDS, b""
+        elif all(type(value) is int and -2 ** 63 <= value < 2 ** 63 for value in values):
+            value_kind, table = VALUES_INT64, array("q", values).tobytes()
+        elif all(type(value) is str for value in values):
+            value_kind, table = VALUES_STR, _table([value.encode() for value in values])
+        elif all(type(value) is bytes for value in values):
+            value_kind, table = VALUES_BYTES, _table(values)
+        else:
+            raise ValueError("graph files hold int64, str or bytes node values only")
+
+        with open(path, "wb") as file:
+            for chunk in (
+                HEADER.pack(MAGIC, VERSION, graph.index_type.encode(), value_kind, nodes, len(graph.targets)),
+                bytes(graph.offsets),
+                bytes(graph.targets),
+            ):
+                file.write(chunk)
+                file.write(b"\0" * _padding(len(chunk)))
+            file.write(table)
+
+    def add_node(self, value):
+        """
+        Mapped graphs are read-only.
+        """
+        raise TypeError("MappedGraph is read-only; build a CSRGraph and write it instead")
+
+    def add_edge(self, node1, node2, weight=1):
+        """
+        Mapped graphs are read-only.
+        """
+        raise TypeError("MappedGraph is read-only; build a CSRGraph and write it instead")
+
+    def clear(self):
+        """
+        Mapped graphs are read-only.
+        """
+        raise TypeError("MappedGraph is read-only; build a CSRGraph and write it instead")
+
+    def close(self):
+        """
+        Release the mapping and close the file.
+        """
+        for name in ("offsets", "targets", "values"):
+            view = getattr(self, name, None)
+            if isinstance(view, (memoryview, _MappedValues)):
+                view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,6 +1,7 @@
 """
 Node class for BFS implementation.
 This class represents a node in a graph or tree structure.
+SlottedNode is a drop-in variant without a per-instance __dict__.
 """
 
 class Node:
@@ -8,12 +9,22 @@ class Node:
         """
         Constructor to create a new node.
         
+        neighbors is a dict rather than a list so that add_neighbor and
+        remove_neighbor check membership in O(1) on high-degree nodes. The
+        cost is memory on sparse graphs: on 64-bit CPython a dict with 1 to 5
+        entries takes 224 bytes against 88 to 120 for a list, about 136 bytes
+        more per node of degree 1 to 4. Code that appended to neighbors
+        directly must call add_neighbor instead.
+        
         Args:
             value: The value to be stored in the node
         """
         self.value = value
-        self.neighbors = []  # List of neighboring nodes
+        self.neighbors = {}  # Neighboring node -> edge weight, insertion-ordered, O(1) lookup
         self.visited = False  # Flag to track if node has been visited during traversal
+        self.index = -1  # Position of the node in its graph, set by BFS.add_node
+        self.in_neighbors = None  # Nodes with an edge to this one, in directed graphs
+        self.graph = None  # BFS that owns the node, whose value index, cache and components it updates
     
     def get_value(self):
         """
@@ -31,6 +42,13 @@ class Node:
         Args:
             value: The new value to be stored
         """
+        graph = self.graph
+        if graph is not None:
+            if graph.value_index is not None:
+                graph.value_index.remove(self.value, self)
+                graph.value_index.add(value, self)
+            if graph.cache is not None:
+                graph.cache.invalidate()
         self.value = value
     
     def get_neighbors(self):
@@ -38,19 +56,60 @@ class Node:
         Get the list of neighboring nodes.
         
         Returns:
-            List of neighboring nodes
+            New list of neighboring nodes, in the order they were added;
+            changing it does not change the node's edges, which add_neighbor
+            and remove_neighbor do
         """
-        return self.neighbors
+        return list(self.neighbors)
     
-    def add_neighbor(self, neighbor):
+    def add_neighbor(self, neighbor, weight=1):
         """
         Add a neighbor to this node.
         
         Args:
             neighbor: The node to be added as a neighbor
+            weight: Weight of the edge; ignored if the neighbor is already there
         """
         if neighbor not in self.neighbors:
-            self.neighbors.append(neighbor)
+            self.neighbors[neighbor] = weight
+            graph = self.graph
+            if graph is not None:
+                graph.components.union(self.index, neighbor.index)
+                if graph.cache is not None:
+                    graph.cache.invalidate()
+    
+    def get_weight(self, neighbor):
+        """
+        Get the weight of the edge to a neighbor.
+        
+        Args:
+            neighbor: A neighboring node
+            
+        Returns:
+            The weight given when the neighbor was added
+        """
+        return self.neighbors[neighbor]
+    
+    def get_in_neighbors(self):
+        """
+        Get the list of nodes with an edge to this node in a directed graph.
+        
+        Returns:
+            List of nodes, in the order their edges were added
+        """
+        return list(self.in_neighbors or ())
+    
+    def add_in_neighbor(self, neighbor):
+        """
+        Record an incoming edge from another node in a directed graph.
+        
+        Args:
+            neighbor: The node the edge comes from
+        """
+        if self.in_neighbors is None:
+            self.in_neighbors = {}
+        if neighbor not in self.in_neighbors:
+            self.in_neighbors[neighbor] = None
     
     def remove_neighbor(self, neighbor):
         """
@@ -60,7 +119,14 @@ class Node:
             neighbor: The node to be removed from neighbors
         """
         if neighbor in self.neighbors:
-            self.neighbors.remove(neighbor)
+            del self.neighbors[neighbor]
+            if neighbor.in_neighbors is not None:
+                neighbor.in_neighbors.pop(self, None)
+            graph = self.graph
+            if graph is not None:
+                graph.components.stale = True
+                if graph.cache is not None:
+                    graph.cache.invalidate()
     
     def is_visited(self):
         """
@@ -85,3 +151,20 @@ class Node:
         Reset the visited status to False.
         """
         self.visited = False
+
+
+class SlottedNode:
+    __slots__ = ("value", "neighbors", "visited", "index", "in_neighbors", "graph")
+
+    __init__ = Node.__init__
+    get_value = Node.get_value
+    set_value = Node.set_value
+    get_neighbors = Node.get_neighbors
+    add_neighbor = Node.add_neighbor
+    get_weight = Node.get_weight
+    get_in_neighbors = Node.get_in_neighbors
+    add_in_neighbor = Node.add_in_neighbor
+    remove_neighbor = Node.remove_neighbor
+    is_visited = Node.is_visited
+    set_visited = Node.set_visited
+    reset_visited = Node.reset_visited
@@ -0,0 +1,280 @@
+"""
+Parallel level-synchronous BFS for BFS implementation.
+This class runs BFS over a process pool that shares one CSR copy of the graph.
+"""
+import os
+from array import array
+from bisect import bisect_left
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from disjoint_set import DisjointSet
+
+_shared = {}  # Arrays attached by each worker process
+
+def _attach(names, index_type):
+    """
+    Pool initializer: attach the shared graph, levels and parents arrays.
+
+    Args:
+        names: Tuple of shared memory block names (offsets, targets, levels,
+            parents, in_offsets, in_targets); the last two name the first two
+            again in undirected graphs
+        index_type: Array typecode of offsets and targets
+    """
+    blocks = [SharedMemory(name=name) for name in names]
+    _shared["blocks"] = blocks  # Keep the mappings alive
+    _shared["offsets"] = blocks[0].buf.cast(index_type)
+    _shared["targets"] = blocks[1].buf.cast(index_type)
+    _shared["levels"] = blocks[2].buf.cast("i")
+    _shared["parents"] = blocks[3].buf.cast("q")
+    _shared["in_offsets"] = blocks[4].buf.cast(index_type)
+    _shared["in_targets"] = blocks[5].buf.cast(index_type)
+
+def _claim(task):
+    """
+    Bottom-up step over a range of node ids: every unvisited node joins the
+    next level if one of its predecessors is on the current level, with the
+    first such predecessor, in row order, as parent (as in BFS.bfs_levels).
+
+    Each worker writes the levels and parents of its own range only, and
+    reads levels that no worker changes during the step, so the result does
+    not depend on how the ranges are scheduled.
+
+    Args:
+        task: Tuple of (first, end, level): the node ids first to end - 1 and
+            the current level
+
+    Returns:
+        Tuple of (found, edges): array of the ids that joined the next level,
+        ascending, and the number of outgoing edges they have
+    """
+    first, end, level = task
+    offsets = _shared["offsets"]
+    in_offsets = _shared["in_offsets"]
+    in_targets = _shared["in_targets"]
+    levels = _shared["levels"]
+    parents = _shared["parents"]
+    found = array("q")
+    edges = 0
+    for v in range(first, end):
+        if levels[v] != -1:
+            continue
+        for k in range(in_offsets[v], in_offsets[v + 1]):
+            u = in_targets[k]
+            if levels[u] == level:
+                levels[v] = level + 1
+                parents[v] = u
+                found.append(v)
+                edges += offsets[v + 1] - offsets[v]
+                break
+    return found, edges
+
+def _union_rows(bounds):
+    """
+    Union-find over the edges of a range of rows.
+
+    Roots are always the smallest id of their set, and only the nodes the
+    edges touch are stored, so each worker holds a forest the size of its slice.
+
+    Args:
+        bounds: Tuple of (first, end) node ids of the rows
+
+    Returns:
+        Flat array of (node, root) pairs for every stored node that is not a root
+    """
+    offsets = _shared["offsets"]
+    targets = _shared["targets"]
+    parent = {}
+
+    def find(i):
+        root = i
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while i != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    first, end = bounds
+    for u in range(first, end):
+        for k in range(offsets[u], offsets[u + 1]):
+            a = find(u)
+            b = find(targets[k])
+            if a < b:
+                parent[b] = a
+            elif b < a:
+                parent[a] = b
+
+    pairs = array("q")
+    for i in parent:
+        root = find(i)
+        if root != i:
+            pairs.append(i)
+            pairs.append(root)
+    return pairs
+
+def _share(source, typecode):
+    """
+    Copy an array into a new shared memory block.
+
+    Returns:
+        Tuple of (block, memoryview of the block cast to typecode)
+    """
+    block = SharedMemory(create=True, size=max(len(source), 1) * source.itemsize)
+    view = block.buf.cast(typecode)
+    view[:len(source)] = source
+    return block, view
+
+class ParallelBFS:
+    def __init__(self, graph, processes=None):
+        """
+        Constructor to copy a CSR graph into shared memory and start the pool.
+
+        Use as a context manager, or call close() to stop the workers and free
+        the shared memory.
+
+        Args:
+            graph: CSRGraph to traverse
+            processes: Number of worker processes (defaults to the CPU count)
+        """
+        graph.compact()
+        self.graph = graph
+        self.processes = processes or os.cpu_count() or 1
+        n = graph.node_count()
+        self._blocks = []
+        self._views = []
+        self._offsets = self._copy_shared(graph.offsets, graph.index_type)
+        self._targets = self._copy_shared(graph.targets, graph.index_type)
+        self._levels = self._copy_shared(array("i", [-1]) * n, "i")
+        self._parents = self._copy_shared(array("q", [-1]) * n, "q")
+        if graph.directed:
+            in_offsets = self._copy_shared(graph.in_offsets, graph.index_type)
+            self._copy_shared(graph.in_targets, graph.index_type)
+        else:
+            in_offsets = self._offsets
+        names = [block.name for block in self._blocks]
+        if not graph.directed:
+            names += names[:2]
+
+        # Split the ids into one range per worker, with about as many edges each
+        edges = in_offsets[n]
+        bounds = [0]
+        for k in range(1, self.processes):
+            bounds.append(max(bisect_left(in_offsets, edges * k // self.processes, 0, n), bounds[-1]))
+        bounds.append(n)
+        self._ranges = [(bounds[k], bounds[k + 1]) for k in range(self.processes) if bounds[k] < bounds[k + 1]]
+        self.pool = Pool(self.processes, initializer=_attach, initargs=(tuple(names), graph.index_type))
+
+    def _copy_shared(self, source, typecode):
+        """
+        Copy an array into a new shared memory block owned by this object.
+
+        Returns:
+            Memoryview of the block cast to typecode
+        """
+        block, view = _share(source, typecode)
+        self._blocks.append(block)
+        self._views.append(view)
+        return view
+
+    def bfs_levels(self, start, alpha=14, beta=24):
+        """
+        Compute the level and BFS-tree parent of every node reachable from start.
+
+        Levels are expanded in the directions BFS.bfs_levels(start) picks with
+        the same alpha and beta. Top-down levels, whose frontiers are small,
+        stay in the calling process. Bottom-up levels are split across the
+        workers, one fixed range of node ids each, and the workers write
+        levels and parents straight into shared memory; the calling process
+        only joins their new frontiers, which are already in id order.
+
+        Args:
+            start: Id of the starting node
+            alpha: Top-down to bottom-up switching threshold
+            beta: Bottom-up to top-down switching threshold
+
+        Returns:
+            Tuple of (levels, parents) arrays indexed by node id, identical to
+            those of BFS.bfs_levels(start, "auto", alpha, beta)
+        """
+        n = self.graph.node_count()
+        levels = self._levels
+        parents = self._parents
+        levels[:n] = array("i", [-1]) * n
+        parents[:n] = array("q", [-1]) * n
+        if start is not None:
+            offsets = self._offsets
+            targets = self._targets
+            levels[start] = 0
+            frontier = array("q", [start])
+            frontier_edges = offsets[start + 1] - offsets[start]
+            unexplored_edges = offsets[n]
+            level = 0
+            bottom_up = False
+            while len(frontier) > 0:
+                unexplored_edges -= frontier_edges
+                if not bottom_up and frontier_edges > unexplored_edges / alpha:
+                    bottom_up = True
+                elif bottom_up and len(frontier) < n / beta:
+                    bottom_up = False
+
+                next_frontier = array("q")
+                frontier_edges = 0
+                if bottom_up:
+                    for found, edges in self.pool.map(_claim, [(first, end, level) for first, end in self._ranges]):
+                        next_frontier.extend(found)
+                        frontier_edges += edges
+                else:
+                    for u in frontier:
+                        for k in range(offsets[u], offsets[u + 1]):
+                            v = targets[k]
+                            if levels[v] == -1:
+                                levels[v] = level + 1
+                                parents[v] = u
+                                next_frontier.append(v)
+                                frontier_edges += offsets[v + 1] - offsets[v]
+                frontier = next_frontier
+                level += 1
+
+        result = array("i")
+        result.frombytes(levels[:n].tobytes())
+        result_parents = array("q")
+        result_parents.frombytes(parents[:n].tobytes())
+        return result, result_parents
+
+    def component_labels(self):
+        """
+        Label every node with the smallest node id in its connected component.
+
+        The rows are split into one contiguous slice per worker, and each
+        worker builds a union-find forest over its slice's edges. The calling
+        process then unions the (node, root) pairs of all the forests.
+
+        Returns:
+            Array of labels indexed by node id, as returned by DisjointSet.labels
+        """
+        n = self.graph.node_count()
+        size = max(-(-n // self.processes), 1)
+        forests = self.pool.map(_union_rows, [(k, min(k + size, n)) for k in range(0, n, size)])
+        components = DisjointSet(n)
+        for pairs in forests:
+            for k in range(0, len(pairs), 2):
+                components.union(pairs[k], pairs[k + 1])
+        return components.labels()
+
+    def close(self):
+        """
+        Stop the worker processes and free the shared memory.
+        """
+        self.pool.close()
+        self.pool.join()
+        for view in self._views:
+            view.release()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,96 @@
+"""
+Query cache for BFS implementation.
+This class keeps the most recently used search results until the graph changes.
+"""
+from collections import OrderedDict
+
+class QueryCache:
+    def __init__(self, maxsize=1024):
+        """
+        Constructor to create a new, empty cache.
+
+        Every change to the graph calls invalidate(), which only bumps the
+        version; entries from older versions are dropped on the next lookup.
+
+        Args:
+            maxsize: Number of results to keep; the least recently used one is
+                evicted first
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()  # Query key -> result, least recently used first
+        self.version = 0  # Bumped by every change to the graph
+        self.hits = 0
+        self.misses = 0
+        self._entries_version = 0  # Version the entries were computed at
+
+    def get(self, key):
+        """
+        Look up the result of a query, counting a hit or a miss.
+
+        Args:
+            key: Hashable description of the query
+
+        Returns:
+            The cached result, or None if the query is not cached for the
+            current version of the graph
+        """
+        self._drop_stale()
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """
+        Store the result of a query, evicting the least recently used one if full.
+
+        Args:
+            key: Hashable description of the query
+            result: The result; must not be None
+        """
+        self._drop_stale()
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def invalidate(self):
+        """
+        Mark every cached result as stale, in O(1).
+        """
+        self.version += 1
+
+    def hit_rate(self):
+        """
+        Get the share of lookups answered from the cache.
+
+        Returns:
+            Hits divided by lookups, or 0.0 before the first lookup
+        """
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def __len__(self):
+        """
+        Get the number of results stored for the current version of the graph.
+
+        Returns:
+            Number of cached results
+        """
+        self._drop_stale()
+        return len(self.entries)
+
+    def _drop_stale(self):
+        """
+        Drop the entries computed before the last invalidate().
+        """
+        if self._entries_version != self.version:
+            self.entries.clear()
+            self._entries_version = self.version
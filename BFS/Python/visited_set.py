@@ -0,0 +1,64 @@
+"""
+Visited set for BFS implementation.
+This class tracks visited nodes by integer id with generation stamps.
+"""
+from array import array
+
+MAX_GENERATION = 2 ** 32 - 1  # Largest stamp an "I" array can hold
+
+class VisitedSet:
+    def __init__(self):
+        """
+        Constructor to create a new, empty visited set.
+
+        A node id i is visited in the current query when
+        stamps[i] == generation, so starting a new query only bumps the
+        generation instead of clearing every entry.
+        """
+        self.stamps = array("I")  # Generation in which each node was last visited
+        self.generation = 0
+
+    def begin(self, size):
+        """
+        Start a new query, forgetting every node visited so far.
+
+        Args:
+            size: Number of node ids the query may visit
+
+        Returns:
+            The generation stamp for the new query
+        """
+        if len(self.stamps) < size:
+            self.stamps.extend(array("I", [0]) * (size - len(self.stamps)))
+        if self.generation == MAX_GENERATION:
+            self.stamps = array("I", [0]) * len(self.stamps)
+            self.generation = 0
+        self.generation += 1
+        return self.generation
+
+    def add(self, index):
+        """
+        Mark a node id as visited in the current query.
+
+        Args:
+            index: Id of the node
+        """
+        self.stamps[index] = self.generation
+
+    def __contains__(self, index):
+        """
+        Check if a node id has been visited in the current query.
+
+        Args:
+            index: Id of the node
+
+        Returns:
+            True if the node has been visited, False otherwise
+        """
+        return self.stamps[index] == self.generation
+
+    def clear(self):
+        """
+        Forget every node visited in the current query.
+        """
+        self.begin(0)
@@ -7,10 +7,15 @@ from BinarySearch.Python.node import Node
 import sys
 
 class BinarySearchTree:
-    def __init__(self):
+    def __init__(self, node_class=Node):
         """
         Constructor to create an empty Binary Search Tree.
+        
+        Args:
+            node_class: Class used for new nodes; pass SlottedNode to store
+                nodes without a per-instance __dict__
         """
+        self.node_class = node_class
         self.root = None
     
     def get_root(self):
@@ -32,7 +37,7 @@ class BinarySearchTree:
         # TODO: Implement this method
         # If the tree is empty, create a new node as root
         # Otherwise, find the correct position to insert the new node
-        new_node = Node(value);
+        new_node = self.node_class(value);
         if self.root == None:
             self.root = new_node
             return
@@ -0,0 +1,62 @@
+"""
+Benchmarks for the Binary Search Tree implementation.
+Run them with: python3 -m BinarySearch.Python.binary_search_tree_benchmark (from the root directory)
+"""
+import random
+import tracemalloc
+from BinarySearch.Python.binary_search_tree import BinarySearchTree
+from BinarySearch.Python.node import Node, SlottedNode
+
+def build_tree(tree, count):
+    """
+    Insert the values 0..count-1 in a fixed random order, so the tree stays shallow.
+    
+    Returns:
+        The tree
+    """
+    values = list(range(count))
+    random.Random(0).shuffle(values)
+    for value in values:
+        tree.insert(value)
+    return tree
+
+def bytes_per_node(build, count):
+    """
+    Measure the memory allocated per node by a structure builder.
+    
+    Args:
+        build: Function that builds and returns a structure with count nodes
+        count: Number of nodes to build
+        
+    Returns:
+        Bytes allocated per node, including the container's own bookkeeping
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    structure = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return (after - before) / count
+
+def benchmark_node_memory(count=100000):
+    """
+    Compare the memory used per node with Node and SlottedNode.
+    """
+    print("\n=== Node Memory ({} nodes) ===".format(count))
+    results = {}
+    for node_class in (Node, SlottedNode):
+        results[node_class] = bytes_per_node(lambda n: build_tree(BinarySearchTree(node_class), n), count)
+        print("{}: {:.0f} bytes per node".format(node_class.__name__, results[node_class]))
+    print("SlottedNode saves {:.0f} bytes per node".format(results[Node] - results[SlottedNode]))
+
+def main():
+    """
+    Main method to run the benchmarks.
+    """
+    print("Running Binary Search Tree Benchmarks...")
+    benchmark_node_memory()
+    print("All benchmarks completed.")
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from BinarySearch.Python.binary_search_tree_template import BinarySearchTreeTemp
 from BinarySearch.Python.binary_search_tree_solution import BinarySearchTreeSolution
 from BinarySearch.Python.binary_search_tree import BinarySearchTree
 from BinarySearch.Python.binary_search_tree_v2 import BinarySearchTreeV2
+from BinarySearch.Python.node import SlottedNode
 import sys
 
 # Uncomment the line below to use your implementation
@@ -295,6 +296,26 @@ def test_height():
     else:
         print("FAIL: get_height does not return 3 for tree with height 3")
 
+def test_slotted_nodes():
+    """
+    Test the tree with SlottedNode nodes.
+    """
+    print("\n=== Testing Slotted Nodes ===")
+    bst = BinarySearchTree(SlottedNode)
+    for value in [50, 30, 70, 20, 40]:
+        bst.insert(value)
+    
+    root = bst.get_root()
+    if isinstance(root, SlottedNode) and not hasattr(root, "__dict__"):
+        print("PASS: Tree stores SlottedNode nodes without a __dict__")
+    else:
+        print("FAIL: Tree does not store SlottedNode nodes")
+    
+    if bst.search(40) and not bst.search(60) and root.get_left().get_value() == 30:
+        print("PASS: Tree operations work with SlottedNode")
+    else:
+        print("FAIL: Tree operations do not work with SlottedNode")
+
 def main():
     """
     Main method to run the tests.
@@ -308,6 +329,7 @@ def main():
     test_traversals()
     test_min_max()
     test_height()
+    test_slotted_nodes()
     
     print("All tests completed.")
 
@@ -1,6 +1,7 @@
 """
 Node class for the Binary Search Tree.
 Each node contains a value and references to left and right child nodes.
+SlottedNode is a drop-in variant without a per-instance __dict__.
 """
 class Node:
     def __init__(self, value):
@@ -67,3 +68,15 @@ class Node:
             right: The new right child node
         """
         self.right = right
+
+
+class SlottedNode:
+    __slots__ = ("value", "left", "right")
+
+    __init__ = Node.__init__
+    get_value = Node.get_value
+    set_value = Node.set_value
+    get_left = Node.get_left
+    set_left = Node.set_left
+    get_right = Node.get_right
+    set_right = Node.set_right
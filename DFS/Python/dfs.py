@@ -3,14 +3,60 @@ Depth-First Search (DFS) implementation.
 This class provides a blueprint for implementing DFS on a graph.
 """
 from node import Node
+from array import array
 from collections import deque
+from operator import attrgetter, index
+from value_index import ValueIndex
+from disjoint_set import DisjointSet
+from visited_set import VisitedSet
+
+# Events reported by the DFS engine (DFS._walk)
+ENTER = 0  # A node is discovered
+EXIT = 1  # All neighbors of a node are done
+REVISIT = 2  # An edge leads to a node that was already visited
 
 class DFS:
-    def __init__(self):
+    def __init__(self, graph=None, index_values=False, node_class=Node, directed=False):
         """
         Constructor to create a new DFS instance.
+        
+        Args:
+            graph: Optional CSRGraph backend. When given, nodes are integer ids
+                into the graph instead of Node objects, and the graph's own
+                directed flag is used.
+            index_values: Maintain a ValueIndex so lookups by value cost O(1).
+                Values must then be hashable, and node values should be changed
+                through Node.set_value (or DFS.set_value for CSR ids).
+            node_class: Class used by add_node; pass SlottedNode to store
+                nodes without a per-instance __dict__.
+            directed: Make add_edge add node1 -> node2 only (recorded as an
+                incoming edge of node2 as well). Traversals follow outgoing
+                edges, and detect_cycle looks for directed cycles.
         """
         self.nodes = []  # List of all nodes in the graph
+        self.node_class = node_class
+        self.graph = graph
+        self.directed = directed if graph is None else graph.directed
+        self.visited = VisitedSet()  # Visited node ids, shared by all traversals
+        self.components = DisjointSet()  # Connected components, updated by add_edge
+        self.order = None  # Topological order (nodes), kept up to date by add_dependency
+        self._position = None  # Node id -> position in self.order
+        self.value_index = None  # Value -> nodes, when index_values is set
+        if index_values:
+            self.value_index = ValueIndex()
+            if graph is not None:
+                for node in graph.get_nodes():
+                    self.value_index.add(graph.get_value(node), node)
+        if graph is None:
+            self._neighbors = attrgetter("neighbors")
+            self._value = attrgetter("value")
+            self._index = attrgetter("index")
+        else:
+            self._neighbors = graph.neighbors
+            self._value = graph.get_value
+            self._index = index
+        if graph is not None:
+            self.components.stale = True  # Built on first use, so opening a graph stays O(1)
     
     def add_node(self, value):
         """
@@ -22,20 +68,129 @@ class DFS:
         Returns:
             The newly created node
         """
-        node = Node(value)
-        self.nodes.append(node)
+        if self.graph is not None:
+            node = self.graph.add_node(value)
+        else:
+            node = self.node_class(value)
+            node.index = len(self.nodes)
+            node.graph = self
+            self.nodes.append(node)
+        if self.order is not None:
+            # A node without edges can go anywhere; put it last
+            self._position.append(len(self.order))
+            self.order.append(node)
+        if self.value_index is not None:
+            self.value_index.add(value, node)
+        self.components.add()
         return node
     
+    def set_value(self, node, value):
+        """
+        Set the value stored in a node, keeping the value index up to date.
+        
+        Args:
+            node: The node to update
+            value: The new value to be stored
+        """
+        if self.graph is None:
+            node.set_value(value)
+            return
+        old_value = self.graph.get_value(node)
+        self.graph.values[node] = value  # Raises on a read-only MappedGraph
+        if self.value_index is not None:
+            self.value_index.remove(old_value, node)
+            self.value_index.add(value, node)
+    
     def add_edge(self, node1, node2):
         """
         Add an edge between two nodes in the graph.
         
         Args:
-            node1: First node
-            node2: Second node
+            node1: First node (the source, if the graph is directed)
+            node2: Second node (the target, if the graph is directed)
+        """
+        self.order = None  # Use add_dependency to keep the order up to date
+        if self.graph is not None:
+            self.graph.add_edge(node1, node2)
+            if len(self.components) != self.graph.node_count():
+                self.components.stale = True  # Nodes were added to the backend directly
+            elif not self.components.stale:
+                self.components.union(node1, node2)
+            return
+        node1.add_neighbor(node2)  # Also merges the components
+        if self.directed:
+            node2.add_in_neighbor(node1)
+        else:
+            node2.add_neighbor(node1)  # For undirected graph
+    
+    def add_dependency(self, node1, node2):
         """
-        node1.add_neighbor(node2)
-        node2.add_neighbor(node1)  # For undirected graph
+        Add a directed edge node1 -> node2 and keep the topological order up to date.
+        
+        The first call sorts the graph; later calls only reorder the nodes
+        between node2 and node1 in the current order, and only when node2 comes
+        before node1. The search stays inside that window, so adding an edge
+        that agrees with the order is O(1).
+        
+        Args:
+            node1: Node that must come first
+            node2: Node that must come after node1
+            
+        Returns:
+            None if the graph is still acyclic, otherwise the values of a cycle
+            in edge order; once the graph has been sorted, this is the cycle
+            closed by the new edge, starting with node1's value
+        """
+        if self.graph is not None:
+            raise ValueError("add_dependency needs Node objects; use add_edge on a directed CSRGraph")
+        if not self.directed:
+            raise ValueError("add_dependency needs a directed graph; create it with directed=True")
+        node1.add_neighbor(node2)  # Also merges the components
+        node2.add_in_neighbor(node1)
+        if self.order is None:
+            return self.topological_order()[1]
+        if node1 is node2:
+            self.order = None
+            return [node1.value]
+
+        position = self._position
+        low = position[node2.index]
+        high = position[node1.index]
+        if low > high:
+            return None
+
+        # Nodes reachable from node2 without leaving the window must move after node1
+        visited = self._begin_visit()
+        stamps = visited.stamps
+        generation = visited.generation
+        stamps[node2.index] = generation
+        parents = {node2: None}
+        stack = [node2]
+        while len(stack) > 0:
+            current = stack.pop()
+            for neighbor_node in current.neighbors:
+                if neighbor_node is node1:
+                    cycle = []
+                    while current is not None:
+                        cycle.append(current.value)
+                        current = parents[current]
+                    cycle.append(node1.value)
+                    cycle.reverse()
+                    self.order = None
+                    return cycle
+                i = neighbor_node.index
+                if stamps[i] != generation and position[i] <= high:
+                    stamps[i] = generation
+                    parents[neighbor_node] = current
+                    stack.append(neighbor_node)
+
+        window = self.order[low:high + 1]
+        window = [node for node in window if stamps[node.index] != generation] + \
+            [node for node in window if stamps[node.index] == generation]
+        self.order[low:high + 1] = window
+        for offset, node in enumerate(window):
+            position[node.index] = low + offset
+        return None
     
     def get_nodes(self):
         """
@@ -44,20 +199,112 @@ class DFS:
         Returns:
             List of all nodes
         """
+        if self.graph is not None:
+            return self.graph.get_nodes()
         return self.nodes
     
     def clear(self):
         """
         Clear all nodes from the graph.
         """
+        if self.graph is not None:
+            self.graph.clear()
+        for node in self.nodes:
+            node.graph = None
         self.nodes.clear()
+        self.components.clear()
+        self.order = None
+        if self.value_index is not None:
+            self.value_index.clear()
+    
+    def find_nodes(self, value):
+        """
+        Find all nodes holding a value.
+        
+        Args:
+            value: Value to search for
+            
+        Returns:
+            List of nodes holding the value, in insertion order; O(1) with a
+            value index, a scan of all nodes otherwise
+        """
+        if self.value_index is not None:
+            return list(self.value_index.get(value) or [])
+        return [node for node in self.get_nodes() if self._value(node) == value]
+    
+    def has_value(self, value):
+        """
+        Check if any node in the graph holds a value.
+        
+        Args:
+            value: Value to search for
+            
+        Returns:
+            True if a node holds the value, False otherwise
+        """
+        if self.value_index is not None:
+            return value in self.value_index
+        return any(self._value(node) == value for node in self.get_nodes())
     
     def reset_visited(self):
         """
         Reset visited status of all nodes.
         """
-        for node in self.nodes:
-            node.reset_visited()
+        self.visited.clear()
+    
+    def _begin_visit(self):
+        """
+        Start a new traversal on the shared visited set.
+        
+        Returns:
+            The shared VisitedSet, emptied for the new traversal
+        """
+        self.visited.begin(len(self.get_nodes()))
+        return self.visited
+    
+    def _walk(self, start_node, visited, revisits=False):
+        """
+        Explicit-stack DFS engine shared by the traversal methods.
+        
+        Each stack entry holds a node and an iterator over its neighbors, so the
+        search resumes where it left off instead of recursing. Depth is limited
+        only by memory, and nodes are discovered in the same order as the
+        recursive DFS.
+        
+        Args:
+            start_node: Node to start from; it must not be visited yet
+            visited: VisitedSet of node ids for the current traversal, updated
+                as nodes are discovered
+            revisits: Also report edges to nodes that were already visited
+            
+        Yields:
+            Tuples of (event, node, other):
+            (ENTER, node, parent) when node is discovered (parent is None for start_node),
+            (EXIT, node, parent) once all of node's neighbors are done,
+            (REVISIT, neighbor, node) for an edge to a visited neighbor, if requested
+        """
+        neighbors = self._neighbors
+        index = self._index
+        stamps = visited.stamps
+        generation = visited.generation
+        stamps[index(start_node)] = generation
+        yield ENTER, start_node, None
+        stack = [(start_node, iter(neighbors(start_node)))]
+
+        while len(stack) > 0:
+            current, cursor = stack[-1]
+            for neighbor_node in cursor:
+                i = index(neighbor_node)
+                if stamps[i] != generation:
+                    stamps[i] = generation
+                    yield ENTER, neighbor_node, current
+                    stack.append((neighbor_node, iter(neighbors(neighbor_node))))
+                    break
+                if revisits:
+                    yield REVISIT, neighbor_node, current
+            else:
+                stack.pop()
+                yield EXIT, current, stack[-1][0] if len(stack) > 0 else None
     
     def dfs_traversal(self, start_node):
         """
@@ -69,40 +316,51 @@ class DFS:
         Returns:
             List of values in DFS order
         """
-        # TODO: Implement this method
-        # 1. Check if start_node is None, return empty list if it is
-        # 2. Create a result list to store the traversal order
-        # 3. Call the recursive helper method to perform DFS
-        # 4. Return the result list
         if start_node == None:
             return []
 
-        visited = []
-
-        self._dfs_recursive(start_node, visited)
-
-        return [node.value for node in visited]
+        visited = self._begin_visit()
+        return [self._value(node) for event, node, _ in self._walk(start_node, visited) if event == ENTER]
     
-    def _dfs_recursive(self, node, result):
+    def iter_dfs(self, start_node):
         """
-        Helper method for recursive DFS traversal.
+        Lazily perform DFS traversal starting from the given node.
+        
+        Nodes are yielded in the same order as dfs_traversal. The stack holds one
+        neighbor iterator per node on the current path, and visited node ids go
+        in a private set that grows with the nodes yielded so far, so taking a
+        few nodes from a huge graph costs no O(V) setup, and other queries can
+        run while the generator is suspended.
         
         Args:
-            node: Current node being visited
-            result: List to store the traversal order
+            start_node: The node to start DFS from
+            
+        Yields:
+            Tuples of (value, depth, parent value), with None as the parent of
+            start_node
         """
-        # TODO: Implement this method
-        # 1. Check if node is None or already visited, return if it is
-        # 2. Mark the node as visited
-        # 3. Add the node's value to the result list
-        # 4. Recursively visit all unvisited neighbors
-        if node == None:
+        if start_node is None:
             return
 
-        result.append(node)
-        for neighbor_node in node.neighbors:
-            if neighbor_node not in result:
-                self._dfs_recursive(neighbor_node, result)
+        neighbors = self._neighbors
+        index = self._index
+        value = self._value
+        seen = {index(start_node)}
+        yield value(start_node), 0, None
+        stack = [(start_node, iter(neighbors(start_node)))]
+
+        while len(stack) > 0:
+            current, cursor = stack[-1]
+            for neighbor_node in cursor:
+                i = index(neighbor_node)
+                if i not in seen:
+                    seen.add(i)
+                    yield value(neighbor_node), len(stack), value(current)
+                    stack.append((neighbor_node, iter(neighbors(neighbor_node))))
+                    break
+            else:
+                stack.pop()
+    
     def dfs_iterative(self, start_node):
         """
         Perform iterative DFS traversal starting from the given node.
@@ -128,20 +386,25 @@ class DFS:
         if start_node == None:
             return []
         
+        stamps = self._begin_visit().stamps
+        generation = self.visited.generation
+        index = self._index
         stack = deque()
-        visited = []
+        result = []
 
         stack.append(start_node)
 
         while len(stack) > 0:
             current = stack.pop()
-            if current not in visited:
-                visited.append(current)
+            i = index(current)
+            if stamps[i] != generation:
+                stamps[i] = generation
+                result.append(self._value(current))
 
-                for neighbor_node in reversed(current.neighbors):
-                    if neighbor_node not in visited:
+                for neighbor_node in reversed(self._neighbors(current)):
+                    if stamps[index(neighbor_node)] != generation:
                         stack.append(neighbor_node)
-        return [node.value for node in visited]
+        return result
 
         
     
@@ -156,121 +419,223 @@ class DFS:
         Returns:
             List of nodes representing the path, or empty list if no path exists
         """
-        # TODO: Implement this method
-        # 1. Check if start_node or end_node is None, return empty list if either is
-        # 2. Reset visited status of all nodes
-        # 3. Create an empty path list
-        # 4. Call the recursive helper method to find a path
-        # 5. If a path is found, convert the nodes to values and return
-        # 6. Otherwise, return an empty list
+        if start_node is None or end_node is None:
+            return []
+
+        path = []
+        for event, node, _ in self._walk(start_node, self._begin_visit()):
+            if event == ENTER:
+                path.append(node)
+                if node == end_node:
+                    return [self._value(node) for node in path]
+            else:
+                path.pop()
         return []
     
-    def _find_path_recursive(self, current, end, path):
+    def find_path_by_value(self, start_value, end_value):
         """
-        Helper method for recursive path finding.
+        Find a path between nodes identified by their values using DFS.
+        
+        The search starts from the first node holding start_value and stops at
+        the first node holding end_value that it enters. Both are resolved
+        through the value index when the graph has one.
         
         Args:
-            current: Current node being visited
-            end: Target node
-            path: Current path being built
+            start_value: Value of the starting node
+            end_value: Value of the target node
             
         Returns:
-            True if a path is found, False otherwise
+            List of values along the path (same format as find_path), or empty
+            list if either value is missing or no path exists
         """
-        # TODO: Implement this method
-        # 1. Mark the current node as visited
-        # 2. Add the current node to the path
-        # 3. If the current node is the end node, return True
-        # 4. For each unvisited neighbor:
-        #    a. Recursively find a path from the neighbor to the end node
-        #    b. If a path is found, return True
-        # 5. If no path is found through any neighbor, remove the current node from the path (backtrack)
-        # 6. Return False
-        return False
+        starts = self.find_nodes(start_value)
+        targets = self.find_nodes(end_value)
+        if len(starts) == 0 or len(targets) == 0:
+            return []
+
+        index = self._index
+        target_ids = {index(node) for node in targets}
+        path = []
+        for event, node, _ in self._walk(starts[0], self._begin_visit()):
+            if event == ENTER:
+                path.append(node)
+                if index(node) in target_ids:
+                    return [self._value(node) for node in path]
+            else:
+                path.pop()
+        return []
     
     def detect_cycle(self):
         """
         Detect if the graph contains a cycle.
         
+        In an undirected graph, a cycle is an edge to an already visited node
+        other than the node it was reached from. In a directed graph, nodes are
+        colored white (unvisited), gray (on the current DFS path) or black
+        (done), and a cycle is an edge to a gray node.
+        
         Returns:
             True if a cycle is detected, False otherwise
         """
-        # TODO: Implement this method
-        # 1. Reset visited status of all nodes
-        # 2. For each unvisited node in the graph:
-        #    a. Call the recursive helper method to detect a cycle
-        #    b. If a cycle is detected, return True
-        # 3. Return False if no cycle is detected
+        visited = self._begin_visit()
+        index = self._index
+        if self.directed:
+            gray = bytearray(len(self.get_nodes()))  # White nodes are not in visited
+            for start_node in self.get_nodes():
+                if index(start_node) in visited:
+                    continue
+                for event, node, _ in self._walk(start_node, visited, revisits=True):
+                    if event == ENTER:
+                        gray[index(node)] = 1
+                    elif event == EXIT:
+                        gray[index(node)] = 0
+                    elif gray[index(node)]:
+                        return True
+            return False
+
+        parents = {}
+        for start_node in self.get_nodes():
+            if index(start_node) in visited:
+                continue
+            for event, node, other in self._walk(start_node, visited, revisits=True):
+                if event == ENTER:
+                    parents[node] = other
+                elif event == REVISIT and node != parents[other]:
+                    return True
         return False
     
-    def _detect_cycle_recursive(self, current, parent):
+    def topological_order(self):
         """
-        Helper method for recursive cycle detection.
+        Sort the graph topologically with Kahn's algorithm, reading each node's
+        neighbors as its outgoing edges.
+        
+        One pass counts in-degrees, a second repeatedly removes nodes whose
+        in-degree dropped to zero. Nodes that are never removed lie on or behind
+        a cycle; one cycle among them is recovered by following predecessors.
+        On success the order is kept in self.order for add_dependency.
         
-        Args:
-            current: Current node being visited
-            parent: Parent node of the current node
-            
         Returns:
-            True if a cycle is detected, False otherwise
-        """
-        # TODO: Implement this method
-        # 1. Mark the current node as visited
-        # 2. For each neighbor of the current node:
-        #    a. If the neighbor is not visited:
-        #       i. Recursively check for a cycle from the neighbor
-        #       ii. If a cycle is detected, return True
-        #    b. If the neighbor is visited and not the parent, a cycle is detected, return True
-        # 3. Return False if no cycle is detected
-        return False
+            Tuple of (order, cycle): (values in topological order, None) for a
+            DAG, or (None, values of a cycle in edge order) otherwise
+        """
+        nodes = self.get_nodes()
+        neighbors = self._neighbors
+        index = self._index
+        indegree = array("q", [0]) * len(nodes)
+        for node in nodes:
+            for neighbor_node in neighbors(node):
+                indegree[index(neighbor_node)] += 1
+
+        queue = deque(node for node in nodes if indegree[index(node)] == 0)
+        order = []
+        while len(queue) > 0:
+            current = queue.popleft()
+            order.append(current)
+            for neighbor_node in neighbors(current):
+                i = index(neighbor_node)
+                indegree[i] -= 1
+                if indegree[i] == 0:
+                    queue.append(neighbor_node)
+
+        if len(order) == len(nodes):
+            self.order = order
+            self._position = array("q", [0]) * len(nodes)
+            for position, node in enumerate(order):
+                self._position[index(node)] = position
+            return [self._value(node) for node in order], None
+
+        # Every node left has a predecessor that is also left, so walking
+        # predecessors must come back to a node already seen
+        self.order = None
+        predecessors = {}
+        for node in nodes:
+            if indegree[index(node)] > 0:
+                for neighbor_node in neighbors(node):
+                    if indegree[index(neighbor_node)] > 0:
+                        predecessors[index(neighbor_node)] = node
+        current = next(node for node in nodes if indegree[index(node)] > 0)
+        seen = {}
+        walk = []
+        while index(current) not in seen:
+            seen[index(current)] = len(walk)
+            walk.append(current)
+            current = predecessors[index(current)]
+        cycle = walk[seen[index(current)]:]
+        cycle.reverse()
+        return None, [self._value(node) for node in cycle]
     
     def topological_sort(self):
         """
         Perform topological sort on a directed acyclic graph (DAG).
         
+        Each node's neighbors are read as its outgoing edges; see topological_order.
+        
         Returns:
             List of values in topological order, or empty list if the graph is not a DAG
         """
-        # TODO: Implement this method
-        # 1. Check if the graph has a cycle (not a DAG), return empty list if it does
-        # 2. Reset visited status of all nodes
-        # 3. Create a stack to store the topological order
-        # 4. For each unvisited node in the graph:
-        #    a. Call the recursive helper method to perform topological sort
-        # 5. Reverse the stack to get the topological order
-        # 6. Convert the nodes to values and return
-        return []
+        order, cycle = self.topological_order()
+        if cycle is not None:
+            return []
+        return order
+    
+    def _rebuild_components(self):
+        """
+        Rebuild the connected components from the adjacency of every node.
+        """
+        index = self._index
+        nodes = self.get_nodes()
+        self.components.reset(len(nodes))  # In place: nodes hold a reference to it
+        for node in nodes:
+            for neighbor_node in self._neighbors(node):
+                self.components.union(index(node), index(neighbor_node))
     
-    def _topological_sort_recursive(self, node, stack):
+    def _current_components(self):
         """
-        Helper method for recursive topological sort.
+        Get the connected components, rebuilding them first if an edge was
+        removed, the backend has not been scanned yet, or nodes were added
+        to the backend directly.
         
-        Args:
-            node: Current node being visited
-            stack: Stack to store the topological order
+        Returns:
+            The up-to-date DisjointSet
         """
-        # TODO: Implement this method
-        # 1. Mark the node as visited
-        # 2. For each unvisited neighbor:
-        #    a. Recursively perform topological sort from the neighbor
-        # 3. Add the node to the stack
-        pass
+        if self.components.stale or len(self.components) != len(self.get_nodes()):
+            self._rebuild_components()
+        return self.components
     
     def count_connected_components(self):
         """
         Count the number of connected components in the graph.
         
+        Components are kept in a DisjointSet that add_node and add_edge update,
+        so this costs O(1). In a directed graph they are the weakly connected
+        components. Removing an edge with Node.remove_neighbor, which union-find
+        cannot undo, makes the next query rebuild them in O(V + E); so does
+        the first query on a CSRGraph backend.
+        
         Returns:
             Number of connected components
         """
-        # TODO: Implement this method
-        # 1. Check if there are no nodes, return 0 if there aren't
-        # 2. Reset visited status of all nodes
-        # 3. Initialize a count to 0
-        # 4. For each node in the graph:
-        #    a. If the node is not visited:
-        #       i. Perform DFS traversal starting from this node
-        #          (this will mark all nodes in the component as visited)
-        #       ii. Increment the count
-        # 5. Return the count
-        return 0
+        return self._current_components().count
+    
+    def same_component(self, node1, node2):
+        """
+        Check if two nodes are in the same connected component.
+        
+        Args:
+            node1: First node
+            node2: Second node
+            
+        Returns:
+            True if a path connects them (ignoring edge directions), False otherwise
+        """
+        return self._current_components().same(self._index(node1), self._index(node2))
+    
+    def component_labels(self):
+        """
+        Label every node with the smallest node id in its connected component.
+        
+        Returns:
+            Array of labels indexed by node id; two nodes are connected (ignoring
+            edge directions) exactly when their labels are equal
+        """
+        return self._current_components().labels()
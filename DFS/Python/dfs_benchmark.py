@@ -0,0 +1,108 @@
+"""
+Benchmarks for the DFS implementation.
+Run them with: python3 -m dfs_benchmark (from DFS/Python)
+"""
+import time
+import tracemalloc
+from dfs import DFS
+from node import Node, SlottedNode
+
+def build_graph(dfs, count):
+    """
+    Build a path graph 0 -- 1 -- ... -- count-1.
+    
+    Returns:
+        The graph
+    """
+    previous = None
+    for i in range(count):
+        node = dfs.add_node(i)
+        if previous is not None:
+            dfs.add_edge(previous, node)
+        previous = node
+    return dfs
+
+def bytes_per_node(build, count):
+    """
+    Measure the memory allocated per node by a structure builder.
+    
+    Args:
+        build: Function that builds and returns a structure with count nodes
+        count: Number of nodes to build
+        
+    Returns:
+        Bytes allocated per node, including the container's own bookkeeping
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    structure = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return (after - before) / count
+
+def benchmark_node_memory(count=100000):
+    """
+    Compare the memory used per node with Node and SlottedNode.
+    """
+    print("\n=== Node Memory ({} nodes) ===".format(count))
+    results = {}
+    for node_class in (Node, SlottedNode):
+        results[node_class] = bytes_per_node(lambda n: build_graph(DFS(node_class=node_class), n), count)
+        print("{}: {:.0f} bytes per node".format(node_class.__name__, results[node_class]))
+    print("SlottedNode saves {:.0f} bytes per node".format(results[Node] - results[SlottedNode]))
+
+def list_dfs_iterative(dfs, start_node):
+    """
+    Iterative DFS with the visited list the DFS class used before VisitedSet,
+    kept here as the baseline for benchmark_visited_crossover.
+    """
+    stack = [start_node]
+    visited = []
+    while len(stack) > 0:
+        current = stack.pop()
+        if current not in visited:
+            visited.append(current)
+            for neighbor_node in reversed(current.neighbors):
+                if neighbor_node not in visited:
+                    stack.append(neighbor_node)
+    return [node.value for node in visited]
+
+def benchmark_visited_crossover(sizes=(10, 100, 1000, 10000, 100000), budget=60.0):
+    """
+    Compare iterative DFS with a visited list (O(n) lookups) and the shared
+    VisitedSet (O(1) lookups) on path graphs of growing size.
+    
+    Args:
+        sizes: Node counts to measure
+        budget: Seconds after which the list version is skipped for larger sizes
+    """
+    print("\n=== Visited Tracking: list vs VisitedSet ===")
+    skip_list = False
+    for count in sizes:
+        dfs = build_graph(DFS(), count)
+        start_node = dfs.get_nodes()[0]
+        start = time.perf_counter()
+        dfs.dfs_iterative(start_node)
+        stamped = time.perf_counter() - start
+        if skip_list:
+            print("{:>7} nodes: list skipped, VisitedSet {:.4f} s".format(count, stamped))
+            continue
+        start = time.perf_counter()
+        list_dfs_iterative(dfs, start_node)
+        listed = time.perf_counter() - start
+        skip_list = listed > budget
+        print("{:>7} nodes: list {:.4f} s, VisitedSet {:.4f} s ({:.1f}x)".format(
+            count, listed, stamped, listed / stamped))
+
+def main():
+    """
+    Main method to run the benchmarks.
+    """
+    print("Running DFS Benchmarks...")
+    benchmark_node_memory()
+    benchmark_visited_crossover()
+    print("All benchmarks completed.")
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,13 @@ from dfs_template import DFSTemplate
 from dfs_solution import DFSSolution
 from dfs import DFS
 from dfs_v2 import DFSV2
+from dfs import DFS as DFSGraph
+from csr_graph import CSRGraph
+from node import SlottedNode
+from graph_loader import GraphLoader
+from mapped_graph import MappedGraph
+import os
+import tempfile
 
 # Uncomment the line below to use your implementation
 # DFS = DFSTemplate
@@ -324,6 +331,475 @@ def test_connected_components():
     else:
         print("FAIL: Graph does not have 2 connected components after connecting two components, got", count)
 
+def test_csr_backend():
+    """
+    Test the DFS operations on the CSR graph backend.
+    """
+    print("\n=== Testing CSR Backend ===")
+    dfs = DFSGraph(CSRGraph())
+    
+    # 1 -- 2 -- 5
+    # |    |
+    # 3 -- 4
+    node1 = dfs.add_node(1)
+    node2 = dfs.add_node(2)
+    node3 = dfs.add_node(3)
+    node4 = dfs.add_node(4)
+    node5 = dfs.add_node(5)
+    
+    dfs.add_edge(node1, node2)
+    dfs.add_edge(node1, node3)
+    dfs.add_edge(node2, node4)
+    dfs.add_edge(node2, node5)
+    dfs.add_edge(node3, node4)
+    
+    result = dfs.dfs_traversal(node1)
+    if result == [1, 2, 4, 3, 5]:
+        print("PASS: CSR DFS traversal visits nodes in neighbor order")
+    else:
+        print("FAIL: CSR DFS traversal order is wrong, got", result)
+    
+    result = dfs.dfs_iterative(node1)
+    if result == [1, 2, 4, 3, 5]:
+        print("PASS: CSR iterative DFS matches the recursive order")
+    else:
+        print("FAIL: CSR iterative DFS order is wrong, got", result)
+
+def test_iter_dfs():
+    """
+    Test the streaming DFS traversal.
+    """
+    print("\n=== Testing Streaming DFS ===")
+    dfs = DFSGraph()
+    
+    # 1 -- 2 -- 5
+    # |    |
+    # 3 -- 4
+    node1 = dfs.add_node(1)
+    node2 = dfs.add_node(2)
+    node3 = dfs.add_node(3)
+    node4 = dfs.add_node(4)
+    node5 = dfs.add_node(5)
+    
+    dfs.add_edge(node1, node2)
+    dfs.add_edge(node1, node3)
+    dfs.add_edge(node2, node4)
+    dfs.add_edge(node2, node5)
+    dfs.add_edge(node3, node4)
+    
+    result = list(dfs.iter_dfs(node1))
+    expected = [(1, 0, None), (2, 1, 1), (4, 2, 2), (3, 3, 4), (5, 2, 2)]
+    if result == expected and [value for value, _, _ in result] == dfs.dfs_traversal(node1):
+        print("PASS: Streaming DFS yields values, depths and parents in DFS order")
+    else:
+        print("FAIL: Streaming DFS yields the wrong sequence, got", result)
+    
+    # Stopping early leaves the rest of the graph unvisited
+    stream = dfs.iter_dfs(node5)
+    if [next(stream)[0], next(stream)[0]] == [5, 2]:
+        print("PASS: Streaming DFS can stop after the first nodes")
+    else:
+        print("FAIL: Streaming DFS does not start with the expected nodes")
+    
+    if list(dfs.iter_dfs(None)) == []:
+        print("PASS: Streaming DFS with null start node yields nothing")
+    else:
+        print("FAIL: Streaming DFS with null start node yields nodes")
+
+def test_value_index():
+    """
+    Test value lookups through the value index.
+    """
+    print("\n=== Testing Value Index ===")
+    dfs = DFSGraph(index_values=True)
+    node1 = dfs.add_node(1)
+    node2 = dfs.add_node(2)
+    other1 = dfs.add_node(1)
+    dfs.add_edge(node1, node2)
+    
+    if dfs.find_nodes(1) == [node1, other1] and dfs.has_value(2) and not dfs.has_value(3):
+        print("PASS: Value index finds duplicate values")
+    else:
+        print("FAIL: Value index lookups are wrong")
+    
+    other1.set_value(3)
+    if dfs.find_nodes(1) == [node1] and dfs.find_nodes(3) == [other1]:
+        print("PASS: Value index follows Node.set_value")
+    else:
+        print("FAIL: Value index is stale after Node.set_value")
+    
+    # 1 -- 2 -- 4 and 2 -- 3 -- 4; the walk enters 3 before the second 4
+    node3 = dfs.add_node(3)
+    node4 = dfs.add_node(4)
+    node4b = dfs.add_node(4)
+    dfs.add_edge(node2, node3)
+    dfs.add_edge(node3, node4)
+    dfs.add_edge(node2, node4b)
+    if dfs.find_path_by_value(1, 4) == [1, 2, 3, 4] and dfs.find_path_by_value(3, 3) == [3] and \
+            dfs.find_path_by_value(1, 5) == []:
+        print("PASS: Path by value stops at the first target the walk enters")
+    else:
+        print("FAIL: Path by value is wrong:", dfs.find_path_by_value(1, 4))
+    
+    for name, graph in (("Object", DFSGraph()), ("CSR", DFSGraph(CSRGraph()))):
+        a = graph.add_node("a")
+        b = graph.add_node("b")
+        graph.add_node("c")
+        graph.add_edge(a, b)
+        if graph.find_path_by_value("b", "a") == ["b", "a"] and graph.find_path_by_value("a", "c") == []:
+            print("PASS: {} path by value works without a value index".format(name))
+        else:
+            print("FAIL: {} path by value is wrong without a value index".format(name))
+    
+    dfs.clear()
+    if not dfs.has_value(1) and dfs.find_nodes(3) == []:
+        print("PASS: Value index is emptied by clear")
+    else:
+        print("FAIL: Value index still has entries after clear")
+
+def test_slotted_nodes():
+    """
+    Test the DFS operations on SlottedNode nodes.
+    """
+    print("\n=== Testing Slotted Nodes ===")
+    dfs = DFSGraph(node_class=SlottedNode)
+    node1 = dfs.add_node(1)
+    node2 = dfs.add_node(2)
+    node3 = dfs.add_node(3)
+    dfs.add_edge(node1, node2)
+    dfs.add_edge(node1, node3)
+    
+    if isinstance(node1, SlottedNode) and not hasattr(node1, "__dict__"):
+        print("PASS: Graph stores SlottedNode nodes without a __dict__")
+    else:
+        print("FAIL: Graph does not store SlottedNode nodes")
+    
+    if dfs.dfs_traversal(node1) == [1, 2, 3] and dfs.dfs_iterative(node2) == [2, 1, 3]:
+        print("PASS: DFS operations work with SlottedNode")
+    else:
+        print("FAIL: DFS operations do not work with SlottedNode")
+
+def test_graph_loader():
+    """
+    Test DFS on a bulk-loaded graph.
+    """
+    print("\n=== Testing Graph Loader ===")
+    loader = GraphLoader()
+    graph = loader.load_edges([(0, 1), (0, 2), (1, 3), (1, 4), (2, 3), (0, 1)], values=[1, 2, 3, 4, 5])
+    dfs = DFSGraph(graph)
+    
+    if dfs.dfs_traversal(0) == [1, 2, 4, 3, 5] and loader.edges_read == 6:
+        print("PASS: Bulk-loaded graph traverses like the add_edge graph")
+    else:
+        print("FAIL: Bulk-loaded graph traverses differently, got", dfs.dfs_traversal(0))
+
+def test_mapped_graph():
+    """
+    Test DFS directly on a memory-mapped graph file.
+    """
+    print("\n=== Testing Mapped Graph ===")
+    graph = CSRGraph.from_edges([1, 2, 3, 4, 5], [(0, 1), (0, 2), (1, 3), (1, 4), (2, 3)])
+    with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as file:
+        path = file.name
+    try:
+        MappedGraph.write(graph, path)
+        with MappedGraph(path) as mapped:
+            dfs = DFSGraph(mapped)
+            result = (dfs.dfs_traversal(0), dfs.dfs_iterative(0))
+        if result == ([1, 2, 4, 3, 5], [1, 2, 4, 3, 5]):
+            print("PASS: DFS traverses the mapped graph in place")
+        else:
+            print("FAIL: DFS traverses the mapped graph incorrectly, got", result)
+        
+        # A rejected edge leaves the components alone: 0 -- 1 and 2 -- 3
+        MappedGraph.write(CSRGraph.from_edges(range(4), [(0, 1), (2, 3)]), path)
+        with MappedGraph(path) as mapped:
+            dfs = DFSGraph(mapped)
+            try:
+                dfs.add_edge(0, 2)
+                print("FAIL: DFS added an edge to a mapped graph")
+            except TypeError:
+                if dfs.count_connected_components() == 2 and not dfs.same_component(0, 2):
+                    print("PASS: Rejected edge does not merge components")
+                else:
+                    print("FAIL: Rejected edge merged components")
+    finally:
+        os.remove(path)
+
+def test_deep_graph():
+    """
+    Test that DFS handles graphs far deeper than the recursion limit.
+    """
+    print("\n=== Testing Deep Graph ===")
+    dfs = DFSGraph()
+    
+    # Path graph 0 -- 1 -- ... -- 99999
+    nodes = [dfs.add_node(i) for i in range(100000)]
+    for i in range(len(nodes) - 1):
+        dfs.add_edge(nodes[i], nodes[i + 1])
+    
+    result = dfs.dfs_traversal(nodes[0])
+    if result == list(range(100000)):
+        print("PASS: DFS traversal of a 100000-deep path does not hit the recursion limit")
+    else:
+        print("FAIL: DFS traversal of a 100000-deep path is wrong")
+    
+    path = dfs.find_path(nodes[0], nodes[-1])
+    if len(path) == 100000 and not dfs.detect_cycle():
+        print("PASS: Find path and cycle detection handle a 100000-deep path")
+    else:
+        print("FAIL: Deep path operations are wrong")
+    
+    dfs.add_edge(nodes[-1], nodes[0])
+    if dfs.detect_cycle():
+        print("PASS: Cycle through the whole path is detected")
+    else:
+        print("FAIL: Cycle through the whole path is not detected")
+    
+    # Directed chain 0 -> 1 -> ... -> 99999
+    dag = DFSGraph(directed=True)
+    nodes = [dag.add_node(i) for i in range(100000)]
+    for i in range(len(nodes) - 1):
+        dag.add_edge(nodes[i], nodes[i + 1])
+    if dag.topological_sort() == list(range(100000)):
+        print("PASS: Topological sort handles a 100000-deep chain")
+    else:
+        print("FAIL: Topological sort of a deep chain is wrong")
+
+def test_visited_tracking():
+    """
+    Test the shared constant-time visited set.
+    """
+    print("\n=== Testing Visited Tracking ===")
+    dfs = DFSGraph()
+    
+    # Path graph 0 -- 1 -- ... -- 19999, deep enough that list lookups would be slow
+    nodes = [dfs.add_node(i) for i in range(20000)]
+    for i in range(len(nodes) - 1):
+        dfs.add_edge(nodes[i], nodes[i + 1])
+    
+    if dfs.dfs_iterative(nodes[0]) == list(range(20000)):
+        print("PASS: Iterative DFS of a 20000-node path is correct")
+    else:
+        print("FAIL: Iterative DFS of a 20000-node path is wrong")
+    
+    # Consecutive queries start from a clean visited set without reset_visited
+    first = dfs.dfs_traversal(nodes[10])
+    second = dfs.dfs_iterative(nodes[10])
+    if first == second and len(first) == 20000 and first[:3] == [10, 9, 8]:
+        print("PASS: Consecutive traversals do not see each other's visited nodes")
+    else:
+        print("FAIL: Consecutive traversals share visited nodes")
+    
+    # A lazy traversal keeps its own visited set while other queries run
+    walk = dfs.iter_dfs(nodes[0])
+    next(walk)
+    dfs.dfs_traversal(nodes[5])
+    if [value for value, _, _ in walk] == list(range(1, 20000)):
+        print("PASS: iter_dfs is not disturbed by queries run while it is suspended")
+    else:
+        print("FAIL: iter_dfs is disturbed by other queries")
+
+def test_topological_order():
+    """
+    Test Kahn's topological sort, cycle reporting and incremental updates.
+    """
+    print("\n=== Testing Topological Order ===")
+    dfs = DFSGraph(directed=True)
+    
+    # 1 -> 2 -> 3, 4 -> 5 -> 6, plus a cycle 7 -> 8 -> 9 -> 7 fed by 6
+    nodes = {value: dfs.add_node(value) for value in range(1, 10)}
+    for a, b in [(1, 2), (2, 3), (4, 5), (5, 6)]:
+        dfs.add_dependency(nodes[a], nodes[b])
+    
+    def respects(order, edges):
+        return sorted(order) == list(range(1, 10)) and \
+            all(order.index(a) < order.index(b) for a, b in edges)
+    
+    edges = [(1, 2), (2, 3), (4, 5), (5, 6)]
+    if respects([node.value for node in dfs.order], edges):
+        print("PASS: Dependencies added one by one keep a valid order")
+    else:
+        print("FAIL: Dependencies added one by one break the order:", [node.value for node in dfs.order])
+    
+    # An edge against the current order is repaired incrementally
+    edges.append((3, 4))
+    if dfs.add_dependency(nodes[3], nodes[4]) is None and respects([node.value for node in dfs.order], edges):
+        print("PASS: Reordering keeps the order valid")
+    else:
+        print("FAIL: Incremental reordering is wrong:", [node.value for node in dfs.order])
+    
+    cycle = dfs.add_dependency(nodes[6], nodes[1])
+    if cycle == [6, 1, 2, 3, 4, 5]:
+        print("PASS: Closing edge reports its cycle:", cycle)
+    else:
+        print("FAIL: Closing edge reported", cycle)
+    
+    # The rejected edge stays in the graph, so a full sort reports a cycle
+    order, cycle = dfs.topological_order()
+    if order is None and sorted(cycle) == [1, 2, 3, 4, 5, 6] and dfs.topological_sort() == []:
+        print("PASS: Kahn's algorithm reports the cycle:", cycle)
+    else:
+        print("FAIL: Kahn's algorithm did not report the cycle:", order, cycle)
+    
+    # Nodes behind a cycle are not part of the reported cycle
+    nodes[1].remove_neighbor(nodes[2])
+    for a, b in [(6, 7), (7, 8), (8, 9), (9, 7)]:
+        dfs.add_edge(nodes[a], nodes[b])
+    order, cycle = dfs.topological_order()
+    if order is None and cycle in ([7, 8, 9], [8, 9, 7], [9, 7, 8]):
+        print("PASS: Cycle downstream of other nodes is reported exactly")
+    else:
+        print("FAIL: Downstream cycle reported as", cycle)
+    
+    # Self-loops are cycles of one node
+    dfs.clear()
+    node = dfs.add_node(1)
+    if dfs.add_dependency(node, node) == [1] and dfs.topological_order() == (None, [1]):
+        print("PASS: Self-loop is reported as a cycle")
+    else:
+        print("FAIL: Self-loop is not reported")
+    
+    undirected = DFSGraph()
+    nodes = [undirected.add_node(1), undirected.add_node(2)]
+    try:
+        undirected.add_dependency(nodes[0], nodes[1])
+        print("FAIL: Undirected graph accepted a dependency")
+    except ValueError:
+        if nodes[0].neighbors or undirected.count_connected_components() != 2:
+            print("FAIL: Rejected dependency changed the graph")
+        else:
+            print("PASS: Undirected graph rejects a dependency")
+
+def test_directed_graph():
+    """
+    Test directed cycle detection and topological sort, with object nodes
+    and the CSR backend.
+    """
+    print("\n=== Testing Directed Graph ===")
+    # The topological sort example: 1 -> 2 -> 3, 1 -> 4 -> 5, 2 -> 5
+    edges = [(1, 2), (1, 4), (2, 3), (2, 5), (4, 5)]
+    for name, dfs in (("Object", DFSGraph(directed=True)), ("CSR", DFSGraph(CSRGraph(directed=True)))):
+        nodes = {value: dfs.add_node(value) for value in range(1, 6)}
+        for a, b in edges:
+            dfs.add_edge(nodes[a], nodes[b])
+        
+        # The diamond 1 -> 2 -> 5 <- 4 <- 1 is a cycle only when undirected
+        if not dfs.detect_cycle():
+            print("PASS: {} DAG has no directed cycle".format(name))
+        else:
+            print("FAIL: {} DAG reported as cyclic".format(name))
+        
+        order = dfs.topological_sort()
+        if len(order) == 5 and all(order.index(a) < order.index(b) for a, b in edges):
+            print("PASS: {} topological sort of added edges:".format(name), order)
+        else:
+            print("FAIL: {} topological sort is wrong:".format(name), order)
+        
+        if dfs.dfs_traversal(nodes[2]) == [2, 3, 5]:
+            print("PASS: {} traversal follows outgoing edges only".format(name))
+        else:
+            print("FAIL: {} traversal ignores edge directions".format(name))
+        
+        dfs.add_edge(nodes[5], nodes[1])
+        order, cycle = dfs.topological_order()
+        if dfs.detect_cycle() and order is None and cycle in ([1, 2, 5], [2, 5, 1], [5, 1, 2], [1, 4, 5], [4, 5, 1], [5, 1, 4]):
+            print("PASS: {} directed cycle detected:".format(name), cycle)
+        else:
+            print("FAIL: {} directed cycle not detected".format(name))
+    
+    dfs = DFSGraph(directed=True)
+    node1 = dfs.add_node(1)
+    node2 = dfs.add_node(2)
+    dfs.add_edge(node1, node2)
+    if node2.get_in_neighbors() == [node1] and node1.get_neighbors() == [node2] and node2.get_neighbors() == []:
+        print("PASS: Directed edges are stored once as outgoing and once as incoming")
+    else:
+        print("FAIL: Directed edge adjacency is wrong")
+
+def test_component_tracking():
+    """
+    Test the incremental connected components and same_component queries.
+    """
+    print("\n=== Testing Component Tracking ===")
+    for name, graph in (("Object", DFSGraph()), ("CSR", DFSGraph(CSRGraph()))):
+        nodes = [graph.add_node(i) for i in range(1000)]
+        if graph.count_connected_components() == 1000:
+            print("PASS: {} graph starts with one component per node".format(name))
+        else:
+            print("FAIL: {} graph does not start with one component per node".format(name))
+        
+        # Join even and odd nodes into two chains, one edge at a time
+        for i in range(2, 1000):
+            graph.add_edge(nodes[i - 2], nodes[i])
+        if graph.count_connected_components() == 2 and graph.same_component(nodes[0], nodes[998]) and \
+                not graph.same_component(nodes[0], nodes[999]):
+            print("PASS: {} graph tracks two chains".format(name))
+        else:
+            print("FAIL: {} graph does not track two chains, got".format(name), graph.count_connected_components())
+        
+        graph.add_edge(nodes[999], nodes[0])
+        graph.add_edge(nodes[1], nodes[2])  # Already connected
+        if graph.count_connected_components() == 1 and graph.same_component(nodes[1], nodes[998]):
+            print("PASS: {} graph merges the chains".format(name))
+        else:
+            print("FAIL: {} graph does not merge the chains".format(name))
+    
+    # Directed edges connect their endpoints in both directions (weak components)
+    graph = DFSGraph(directed=True)
+    node1 = graph.add_node(1)
+    node2 = graph.add_node(2)
+    node3 = graph.add_node(3)
+    graph.add_edge(node2, node1)
+    if graph.count_connected_components() == 2 and graph.same_component(node1, node2):
+        print("PASS: Directed graph has weakly connected components")
+    else:
+        print("FAIL: Directed graph components are wrong")
+    
+    # A CSR graph loaded before the search object is created is scanned on
+    # first use, and edges added before then are not lost
+    graph = DFSGraph(CSRGraph.from_edges(range(6), [(0, 1), (2, 3), (3, 4)]))
+    scanned = len(graph.components) > 0
+    graph.add_edge(1, graph.add_node(6))
+    if not scanned and graph.count_connected_components() == 3 and graph.same_component(2, 4) and \
+            graph.same_component(0, 6):
+        print("PASS: Components of a prebuilt CSR graph are found on first use")
+    else:
+        print("FAIL: Components of a prebuilt CSR graph are wrong")
+    
+    # An edge to a node added to the backend directly rescans the components
+    backend = CSRGraph()
+    graph = DFSGraph(backend)
+    a = graph.add_node(0)
+    graph.count_connected_components()
+    x = backend.add_node(1)
+    graph.add_edge(a, x)
+    if graph.count_connected_components() == 1 and graph.same_component(a, x):
+        print("PASS: Edge to a node added to the backend directly updates the components")
+    else:
+        print("FAIL: Edge to a node added to the backend directly left stale components")
+    
+    # Edges changed on the nodes themselves: x -- y, then y -- z directly
+    graph = DFSGraph()
+    x, y, z = graph.add_node("x"), graph.add_node("y"), graph.add_node("z")
+    graph.add_edge(x, y)
+    y.add_neighbor(z)
+    z.add_neighbor(y)
+    joined = graph.count_connected_components() == 1
+    x.remove_neighbor(y)
+    y.remove_neighbor(x)
+    if joined and not graph.same_component(x, y) and graph.same_component(y, z) and \
+            graph.count_connected_components() == 2:
+        print("PASS: Node.add_neighbor and Node.remove_neighbor update the components")
+    else:
+        print("FAIL: Components are stale after changing node edges")
+    
+    labels = DFSGraph(CSRGraph.from_edges(range(6), [(0, 1), (2, 3), (3, 4)])).component_labels()
+    if list(labels) == [0, 0, 2, 2, 2, 5]:
+        print("PASS: Component labels are the smallest node id of each component")
+    else:
+        print("FAIL: Component labels are wrong:", list(labels))
+
 def main():
     """
     Main method to run the tests.
@@ -337,6 +813,17 @@ def main():
     test_detect_cycle()
     test_topological_sort()
     test_connected_components()
+    test_csr_backend()
+    test_iter_dfs()
+    test_value_index()
+    test_slotted_nodes()
+    test_graph_loader()
+    test_mapped_graph()
+    test_deep_graph()
+    test_visited_tracking()
+    test_topological_order()
+    test_directed_graph()
+    test_component_tracking()
     
     print("All tests completed.")
 
@@ -0,0 +1,137 @@
+"""
+Disjoint-set (union-find) structure for DFS implementation.
+This class tracks connected components by integer node id as edges are added.
+"""
+from array import array
+
+class DisjointSet:
+    def __init__(self, size=0):
+        """
+        Constructor to create a disjoint set of size singleton components.
+
+        Finds compress the path to the root and unions attach the root of
+        lower rank under the other, so any sequence of operations costs
+        O(alpha(n)) each, amortized.
+
+        Args:
+            size: Number of ids (0 to size - 1) to start with
+        """
+        self.parent = array("q", range(size))  # Parent id; roots are their own parent
+        self.rank = bytearray(size)  # Upper bound on the height of each root's tree
+        self.count = size  # Number of components
+        self.stale = False  # Set when an edge is removed, which a union cannot undo
+
+    def add(self):
+        """
+        Add a new id in a component of its own.
+
+        Returns:
+            The new id
+        """
+        i = len(self.parent)
+        self.parent.append(i)
+        self.rank.append(0)
+        self.count += 1
+        return i
+
+    def find(self, i):
+        """
+        Find the representative of the component holding an id.
+
+        Args:
+            i: The id
+
+        Returns:
+            Id of the component's root
+        """
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def union(self, i, j):
+        """
+        Merge the components holding two ids.
+
+        Args:
+            i: First id
+            j: Second id
+
+        Returns:
+            True if the ids were in different components, False otherwise
+        """
+        i = self.find(i)
+        j = self.find(j)
+        if i == j:
+            return False
+        rank = self.rank
+        if rank[i] < rank[j]:
+            i, j = j, i
+        self.parent[j] = i
+        if rank[i] == rank[j]:
+            rank[i] += 1
+        self.count -= 1
+        return True
+
+    def same(self, i, j):
+        """
+        Check if two ids are in the same component.
+
+        Args:
+            i: First id
+            j: Second id
+
+        Returns:
+            True if they are connected, False otherwise
+        """
+        return self.find(i) == self.find(j)
+
+    def labels(self):
+        """
+        Label every id with the smallest id in its component.
+
+        Returns:
+            Array of labels indexed by id
+        """
+        n = len(self.parent)
+        smallest = array("q", [-1]) * n  # Smallest id seen so far under each root
+        labels = array("q", [0]) * n
+        for i in range(n):
+            root = self.find(i)
+            if smallest[root] == -1:
+                smallest[root] = i
+            labels[i] = smallest[root]
+        return labels
+
+    def reset(self, size):
+        """
+        Put ids 0 to size - 1 back in components of their own, keeping this object.
+
+        Args:
+            size: Number of ids to keep
+        """
+        self.parent = array("q", range(size))
+        self.rank = bytearray(size)
+        self.count = size
+        self.stale = False
+
+    def __len__(self):
+        """
+        Get the number of ids.
+
+        Returns:
+            Number of ids, in all components
+        """
+        return len(self.parent)
+
+    def clear(self):
+        """
+        Remove every id.
+        """
+        self.parent = array("q")
+        self.rank = bytearray()
+        self.count = 0
+        self.stale = False
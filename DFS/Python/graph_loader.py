@@ -0,0 +1,206 @@
+"""
+Bulk graph loader for DFS implementation.
+This class builds CSR graphs from edge-list files, arrays or iterables in a few passes.
+"""
+import time
+import warnings
+from array import array
+from itertools import chain
+from csr_graph import CSRGraph
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; the pure-Python passes are used instead
+    numpy = None
+
+def _fields(line, comment):
+    """
+    Split an edge-list line on whitespace and commas, dropping any comment.
+    """
+    if comment is not None:
+        line = line.split(comment, 1)[0]
+    return line.replace(b",", b" ").split()
+
+class GraphLoader:
+    def __init__(self, index_type="i"):
+        """
+        Constructor to create a new loader.
+
+        Args:
+            index_type: Array typecode for the graphs it builds, "i" (int32)
+                or "q" (int64)
+        """
+        self.index_type = index_type
+        self.edges_read = 0  # Edges in the last input, duplicates included
+        self.adjacency_entries = 0  # Neighbor entries in the last graph, after deduplication
+        self.seconds = 0.0  # Wall time of the last load
+
+    def load_file(self, path, values=None, comment="#"):
+        """
+        Load an edge-list text or CSV file with one "src dst" or "src,dst" pair per line.
+
+        Blank lines, comments (whole lines or the end of a line) and a header
+        line before the first edge, such as "src,dst", are skipped. With NumPy
+        the file is parsed by numpy.loadtxt; without it the file is streamed
+        a line at a time, so only the parsed ids are held in memory.
+
+        Args:
+            path: Path of the file
+            values: Optional node values; node ids are used as values otherwise
+            comment: Comments start with this prefix
+
+        Returns:
+            The loaded CSRGraph
+        """
+        start = time.perf_counter()
+        marker = comment.encode() if comment else None
+        with open(path, "rb") as file:
+            skipped = 0  # Lines before the first edge
+            header = False
+            for line in file:
+                fields = _fields(line, marker)
+                if fields and (header or all(field.lstrip(b"-").isdigit() for field in fields)):
+                    break
+                header = header or bool(fields)
+                skipped += 1
+            else:
+                fields, line = [], b""
+            if marker is not None:
+                line = line.split(marker, 1)[0]
+            delimiter = "," if b"," in line else None  # Judged by the first edge, not the header
+
+            if numpy is None:
+                src = array("q")
+                dst = array("q")
+                for fields in chain([fields], (_fields(line, marker) for line in file)):
+                    if not fields:
+                        continue
+                    if len(fields) != 2:
+                        raise ValueError("every line of an edge list must hold exactly two node ids")
+                    src.append(int(fields[0]))
+                    dst.append(int(fields[1]))
+                return self._load(src, dst, values, start)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # A file without edges
+            pairs = numpy.loadtxt(path, dtype=numpy.int64, comments=comment or None,
+                                  delimiter=delimiter, skiprows=skipped, ndmin=2)
+        if pairs.size == 0:
+            pairs = pairs.reshape(0, 2)
+        if pairs.shape[1] != 2:
+            raise ValueError("every line of an edge list must hold exactly two node ids")
+        return self._load(pairs[:, 0], pairs[:, 1], values, start)
+
+    def load_arrays(self, src, dst, values=None):
+        """
+        Load edges given as two parallel arrays of node ids.
+
+        NumPy arrays are built with vectorized passes when NumPy is installed.
+
+        Args:
+            src: Array of source node ids
+            dst: Array of destination node ids, same length as src
+            values: Optional node values; node ids are used as values otherwise
+
+        Returns:
+            The loaded CSRGraph
+        """
+        if len(src) != len(dst):
+            raise ValueError("src and dst must have the same length")
+        return self._load(src, dst, values, time.perf_counter())
+
+    def load_edges(self, edges, values=None):
+        """
+        Load edges from an iterable of (src, dst) node id pairs.
+
+        Args:
+            edges: Iterable of (src, dst) pairs
+            values: Optional node values; node ids are used as values otherwise
+
+        Returns:
+            The loaded CSRGraph
+        """
+        start = time.perf_counter()
+        src = array("q")
+        dst = array("q")
+        for u, v in edges:
+            src.append(u)
+            dst.append(v)
+        return self._load(src, dst, values, start)
+
+    def throughput(self):
+        """
+        Get the speed of the last load.
+
+        Returns:
+            Edges read per second
+        """
+        if self.seconds == 0:
+            return 0.0
+        return self.edges_read / self.seconds
+
+    def report(self):
+        """
+        Describe the last load.
+
+        Returns:
+            A one-line summary of edges read, adjacency size, time and throughput
+        """
+        return "Loaded {} edges ({} adjacency entries) in {:.3f} s, {:.0f} edges/s".format(
+            self.edges_read, self.adjacency_entries, self.seconds, self.throughput())
+
+    def _load(self, src, dst, values, start):
+        """
+        Build a graph from parallel id arrays and record the load statistics.
+        """
+        if numpy is not None:
+            src = numpy.asarray(src, dtype=numpy.int64)
+            dst = numpy.asarray(dst, dtype=numpy.int64)
+            num_nodes = int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+        else:
+            num_nodes = max(max(src, default=-1), max(dst, default=-1)) + 1
+        if values is None:
+            values = range(num_nodes)
+        elif len(values) < num_nodes:
+            raise ValueError("values must cover every node id in the edges")
+
+        if numpy is not None:
+            graph = self._build_vectorized(src, dst, values)
+        else:
+            graph = CSRGraph.from_edges(values, zip(src, dst), self.index_type)
+
+        self.edges_read = len(src)
+        self.adjacency_entries = len(graph.targets)
+        self.seconds = time.perf_counter() - start
+        return graph
+
+    def _build_vectorized(self, src, dst, values):
+        """
+        Build the CSR arrays with NumPy: interleave both directions in edge order,
+        drop repeated (src, dst) pairs, then stable-sort by source.
+        """
+        n = len(values)
+        m = len(src)
+        sources = numpy.empty(2 * m, dtype=numpy.int64)
+        targets = numpy.empty(2 * m, dtype=numpy.int64)
+        sources[0::2] = src
+        sources[1::2] = dst
+        targets[0::2] = dst
+        targets[1::2] = src
+
+        _, first = numpy.unique(sources * n + targets, return_index=True)
+        keep = numpy.zeros(2 * m, dtype=bool)
+        keep[first] = True
+        sources = sources[keep]
+        targets = targets[keep]
+
+        order = numpy.argsort(sources, kind="stable")
+        offsets = numpy.zeros(n + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(sources, minlength=n), out=offsets[1:])
+
+        dtype = numpy.int32 if self.index_type == "i" else numpy.int64
+        graph = CSRGraph(self.index_type)
+        graph.values.extend(values)
+        graph.offsets = array(self.index_type, offsets.astype(dtype).tobytes())
+        graph.targets = array(self.index_type, targets[order].astype(dtype).tobytes())
+        return graph
@@ -0,0 +1,74 @@
+"""
+Value index for DFS implementation.
+This class maps node values to the nodes holding them.
+"""
+
+class ValueIndex:
+    def __init__(self):
+        """
+        Constructor to create a new, empty value index.
+        Values must be hashable; several nodes may hold the same value.
+        """
+        self.nodes = {}  # Value -> list of nodes holding it, in insertion order
+
+    def add(self, value, node):
+        """
+        Record that a node holds a value.
+
+        Args:
+            value: The value held by the node
+            node: The node
+        """
+        nodes = self.nodes.get(value)
+        if nodes is None:
+            self.nodes[value] = [node]
+        else:
+            nodes.append(node)
+
+    def remove(self, value, node):
+        """
+        Forget that a node holds a value.
+
+        Args:
+            value: The value previously held by the node
+            node: The node
+        """
+        nodes = self.nodes.get(value)
+        if nodes is None:
+            return
+        for i, other in enumerate(nodes):
+            if other is node:
+                del nodes[i]
+                break
+        if len(nodes) == 0:
+            del self.nodes[value]
+
+    def get(self, value):
+        """
+        Get the nodes holding a value.
+
+        Args:
+            value: The value to look up
+
+        Returns:
+            List of nodes holding the value, or None if there are none
+        """
+        return self.nodes.get(value)
+
+    def __contains__(self, value):
+        """
+        Check if any node holds a value.
+
+        Args:
+            value: The value to look up
+
+        Returns:
+            True if the value is in the index, False otherwise
+        """
+        return value in self.nodes
+
+    def clear(self):
+        """
+        Remove every entry from the index.
+        """
+        self.nodes.clear()
@@ -7,10 +7,15 @@ from node import Node
 import sys
 
 class LinkedList:
-    def __init__(self):
+    def __init__(self, node_class=Node):
         """
         Constructor to create an empty LinkedList.
+        
+        Args:
+            node_class: Class used for new nodes; pass SlottedNode to store
+                nodes without a per-instance __dict__
         """
+        self.node_class = node_class
         self.head = None
         self.size = 0
     
@@ -53,7 +58,7 @@ class LinkedList:
         # Set the new node's next to the current head
         # Update the head to the new node
         # Increment the size
-        newNode = Node(value)
+        newNode = self.node_class(value)
         newNode.next = self.head
         self.head = newNode
         self.size += 1
@@ -70,7 +75,7 @@ class LinkedList:
         # If the list is empty, set the head to the new node
         # Otherwise, traverse to the end of the list and set the last node's next to the new node
         # Increment the size
-        newNode = Node(value)
+        newNode = self.node_class(value)
         if self.head == None:
             self.head = newNode
             self.size += 1
@@ -112,7 +117,7 @@ class LinkedList:
             return True
 
         position_counter = 0
-        newNode = Node(value)
+        newNode = self.node_class(value)
         current = self.head
         prev = None
         while current != None:
@@ -0,0 +1,59 @@
+"""
+Benchmarks for the LinkedList implementation.
+Run them with: python3 -m linked_list_benchmark (from LinkedList/Python)
+"""
+import tracemalloc
+from linked_list import LinkedList
+from node import Node, SlottedNode
+
+def build_list(linked_list, count):
+    """
+    Insert count values at the beginning of a list.
+    
+    Returns:
+        The list
+    """
+    for i in range(count):
+        linked_list.insert_at_beginning(i)
+    return linked_list
+
+def bytes_per_node(build, count):
+    """
+    Measure the memory allocated per node by a structure builder.
+    
+    Args:
+        build: Function that builds and returns a structure with count nodes
+        count: Number of nodes to build
+        
+    Returns:
+        Bytes allocated per node, including the container's own bookkeeping
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    structure = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return (after - before) / count
+
+def benchmark_node_memory(count=100000):
+    """
+    Compare the memory used per node with Node and SlottedNode.
+    """
+    print("\n=== Node Memory ({} nodes) ===".format(count))
+    results = {}
+    for node_class in (Node, SlottedNode):
+        results[node_class] = bytes_per_node(lambda n: build_list(LinkedList(node_class), n), count)
+        print("{}: {:.0f} bytes per node".format(node_class.__name__, results[node_class]))
+    print("SlottedNode saves {:.0f} bytes per node".format(results[Node] - results[SlottedNode]))
+
+def main():
+    """
+    Main method to run the benchmarks.
+    """
+    print("Running LinkedList Benchmarks...")
+    benchmark_node_memory()
+    print("All benchmarks completed.")
+
+if __name__ == "__main__":
+    main()
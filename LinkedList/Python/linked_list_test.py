@@ -5,6 +5,7 @@ This class provides methods to test various operations of the LinkedList.
 from linked_list_template import LinkedListTemplate
 from linked_list_solution import LinkedListSolution
 from linked_list import LinkedList
+from node import SlottedNode
 import sys
 
 # Uncomment the line below to use your implementation
@@ -278,6 +279,27 @@ def test_middle():
     else:
         print("FAIL: find middle in even-length list")
 
+def test_slotted_nodes():
+    """
+    Test the list with SlottedNode nodes.
+    """
+    print("\n=== Testing Slotted Nodes ===")
+    ll = LinkedList(SlottedNode)
+    ll.insert_at_end(2)
+    ll.insert_at_beginning(1)
+    ll.insert_at_end(3)
+    
+    head = ll.get_head()
+    if isinstance(head, SlottedNode) and not hasattr(head, "__dict__"):
+        print("PASS: List stores SlottedNode nodes without a __dict__")
+    else:
+        print("FAIL: List does not store SlottedNode nodes")
+    
+    if ll.search(3) and ll.get_value_at_position(1) == 2 and ll.get_size() == 3:
+        print("PASS: List operations work with SlottedNode")
+    else:
+        print("FAIL: List operations do not work with SlottedNode")
+
 def main():
     """
     Main method to run the tests.
@@ -292,6 +314,7 @@ def main():
     test_reverse()
     test_cycle()
     test_middle()
+    test_slotted_nodes()
     
     print("All tests completed.")
 
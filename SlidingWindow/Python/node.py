@@ -1,6 +1,7 @@
 """
 Node class for SlidingWindow implementation.
 This class represents a node in a linked list or array-like structure.
+SlottedNode is a drop-in variant without a per-instance __dict__.
 """
 
 class Node:
@@ -49,3 +50,13 @@ class Node:
             next_node: The node to be set as the next node
         """
         self.next = next_node
+
+
+class SlottedNode:
+    __slots__ = ("value", "next")
+
+    __init__ = Node.__init__
+    get_value = Node.get_value
+    set_value = Node.set_value
+    get_next = Node.get_next
+    set_next = Node.set_next